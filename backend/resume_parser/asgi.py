@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "resume_parser.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from resumes.body_limit import RequestBodyLimitMiddleware  # noqa: E402 (needs Django set up)
+
+# Django buffers the whole request body before any view runs, so upload size limits
+# are enforced here, before the body is read
+application = RequestBodyLimitMiddleware(django_application, settings.REQUEST_BODY_LIMITS)
@@ -0,0 +1,16 @@
+"""
+Celery config for resume_parser project.
+
+Workers are started with ``celery -A resume_parser worker`` and read every
+``CELERY_*`` setting from the Django settings module.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "resume_parser.settings")
+
+app = Celery("resume_parser")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +47,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Compresses responses (zstd, br or gzip, per Accept-Encoding), including ones async
+    # views stream; kept ahead of the middleware that reads or changes the response body
+    "resumes.middleware.AsyncStreamingCompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -52,6 +57,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Converts exceptions the API views do not handle into 500 JSON responses
+    "resumes.middleware.JsonExceptionMiddleware",
 ]
 
 ROOT_URLCONF = "resume_parser.urls"
@@ -125,6 +132,21 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+# Queued resumes are stored here until a worker processes them; the web and worker
+# processes must share this storage (a common volume, or a remote storage backend)
+MEDIA_ROOT = BASE_DIR / "media"
+
+# Keep uploads up to the 10MB resume limit in memory instead of spooling them to a
+# temporary file (Django's default threshold is 2.5MB)
+FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
+
+# Under ASGI, request bodies to these paths are rejected with 413 before Django reads
+# them (see resumes.body_limit); the 1MB over the file limits covers multipart framing
+REQUEST_BODY_LIMITS = {
+    "/api/process/": 11 * 1024 * 1024,
+    "/api/process-batch/": 101 * 1024 * 1024,
+}
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
@@ -138,3 +160,74 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # OpenAI API Configuration
 # Set your OpenAI API key as an environment variable: export OPENAI_API_KEY="your-api-key"
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', None)
+
+# Limits applied to concurrent LLM calls when processing resumes in batches
+OPENAI_MAX_CONCURRENCY = 10
+OPENAI_MAX_REQUESTS_PER_MINUTE = 500
+OPENAI_MAX_TOKENS_PER_MINUTE = 200000
+
+# Batch uploads send up to this many resumes (and roughly this many input tokens) per LLM request
+LLM_BATCH_MAX_RESUMES = 8
+LLM_BATCH_MAX_INPUT_TOKENS = 8000
+
+# Caches for parsed resumes ("default") and get_candidates responses ("candidates").
+# Set REDIS_URL in production so every worker process shares them; otherwise parsed
+# resumes are cached per process and get_candidates responses are not cached.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+        "candidates": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        # Listings must be invalidated in every worker process, which a per-process
+        # cache cannot do, so listing caching is off without Redis
+        "candidates": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        },
+    }
+CANDIDATE_CACHE_TTL = 60  # seconds
+# Parser output is also cached by a hash of the PDF bytes, so identical uploads skip the LLM
+PARSED_RESUME_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Celery task queue. When a broker is configured, POST /api/process/ queues the resume
+# and returns 202 with a job id; without one, resumes are processed in the request.
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+# Job status is polled from any web process, so results need a shared store. A Redis
+# broker doubles as one; other brokers (e.g. RabbitMQ, amqp://) cannot store results,
+# so CELERY_RESULT_BACKEND must be set, e.g. to redis://... or db+postgresql://...
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND')
+if not CELERY_RESULT_BACKEND and CELERY_BROKER_URL and CELERY_BROKER_URL.startswith(('redis://', 'rediss://')):
+    CELERY_RESULT_BACKEND = CELERY_BROKER_URL
+if CELERY_BROKER_URL and not CELERY_RESULT_BACKEND:
+    raise ImproperlyConfigured("CELERY_RESULT_BACKEND must be set when CELERY_BROKER_URL is not a Redis URL")
+CELERY_TASK_TRACK_STARTED = True
+# Resume parsing waits on the LLM, so it runs on its own queue and worker pool:
+#   celery -A resume_parser worker -Q llm
+CELERY_TASK_ROUTES = {
+    'resumes.tasks.parse_resume_task': {'queue': 'llm'},
+}
+RESUME_PROCESSING_QUEUE_ENABLED = bool(CELERY_BROKER_URL)
+
+# LLM response cache (SQLite file keyed by SHA256 of model + normalized prompt)
+LLM_CACHE_PATH = BASE_DIR / "llm_cache.sqlite3"
+LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', 24 * 60 * 60))  # seconds
+# How long a cache read or write waits for another process's write lock before the
+# cache is skipped for that call
+LLM_CACHE_BUSY_TIMEOUT = 0.5  # seconds
+
+# Semantic cache: reuse the extraction of a near-duplicate resume (cosine similarity of
+# the resume embeddings at or above the threshold) instead of calling the LLM again
+LLM_SEMANTIC_CACHE_ENABLED = True
+LLM_SEMANTIC_CACHE_THRESHOLD = 0.92
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ResumesConfig(AppConfig):
   default_auto_field = "django.db.models.BigAutoField"
   name = "resumes"
+
+  def ready(self):
+    # Register the cache invalidation signal handlers
+    from . import signals  # noqa: F401
@@ -0,0 +1,63 @@
+"""
+Request body limit module.
+This module provides ASGI middleware that rejects oversized upload bodies before
+Django reads them: under ASGI, Django buffers the whole body into memory or a
+temporary file before any upload handler or view runs.
+"""
+
+import orjson
+from rest_framework import status
+
+
+async def _send_too_large(send, limit):
+    body = orjson.dumps({"error": f"Request body must be at most {limit // (1024 * 1024)}MB"})
+    await send({
+        'type': 'http.response.start',
+        'status': status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+class RequestBodyLimitMiddleware:
+    """
+    Reject request bodies over a per-path byte limit with a 413 JSON response.
+
+    A declared Content-Length over the limit is rejected before any of the body is
+    read. Bodies sent without one are counted as they arrive; once they pass the
+    limit the 413 is sent and Django is told the client disconnected, so it stops
+    reading and sends no response of its own.
+    """
+
+    def __init__(self, app, limits):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope['path']) if scope['type'] == 'http' else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        content_length = dict(scope['headers']).get(b'content-length', b'')
+        if content_length.isdigit() and int(content_length) > limit:
+            return await _send_too_large(send, limit)
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message['type'] == 'http.request' and not rejected:
+                received += len(message.get('body', b''))
+                if received > limit:
+                    rejected = True
+                    await _send_too_large(send, limit)
+                    return {'type': 'http.disconnect'}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
@@ -0,0 +1,67 @@
+"""
+Candidate listing cache module.
+This module caches serialized get_candidates responses in Django's cache, keyed by a
+hash of the request parameters and invalidated whenever candidate data changes. It uses
+the "candidates" cache alias, which must be shared by all worker processes (or a
+DummyCache, which disables listing caching).
+"""
+
+import json
+import hashlib
+from typing import Any, Dict, Optional
+from django.conf import settings
+from django.core.cache import caches
+
+CACHE_TTL = getattr(settings, 'CANDIDATE_CACHE_TTL', 60)
+CACHE_ALIAS = 'candidates'
+
+# Every key embeds the current generation; bumping it orphans all cached listings at
+# once (they expire via the TTL), which works on any cache backend
+GENERATION_KEY = 'candidates:generation'
+
+
+def _get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _get_generation() -> int:
+    cache = _get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 0, timeout=None)
+        generation = cache.get(GENERATION_KEY, 0)
+    return generation
+
+
+def make_cache_key(params: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a get_candidates request.
+
+    Args:
+        params: The validated filter and pagination parameters
+
+    Returns:
+        str: Key for the current generation
+    """
+    digest = hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=16).hexdigest()
+    return f"candidates:{_get_generation()}:{digest}"
+
+
+def get_cached_response(key: str) -> Optional[bytes]:
+    """Return the cached response body for the key, or None on a miss."""
+    return _get_cache().get(key)
+
+
+def store_response(key: str, body: bytes) -> None:
+    """Cache a response body for CACHE_TTL seconds."""
+    _get_cache().set(key, body, CACHE_TTL)
+
+
+def invalidate() -> None:
+    """Drop every cached listing by moving to a new generation."""
+    cache = _get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # Generation not set yet (or evicted): start a fresh one
+        cache.set(GENERATION_KEY, 1, timeout=None)
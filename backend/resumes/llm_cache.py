@@ -0,0 +1,260 @@
+"""
+LLM response cache module.
+This module provides a persistent SQLite-backed cache for LLM responses, keyed by a
+SHA256 hash of the model name and the normalized prompt, and a semantic cache that
+matches near-duplicate resumes by embedding similarity.
+"""
+
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List
+import numpy as np
+from django.conf import settings
+
+# Cache configuration (override in settings.py)
+CACHE_PATH = str(getattr(settings, 'LLM_CACHE_PATH', settings.BASE_DIR / 'llm_cache.sqlite3'))
+CACHE_TTL = getattr(settings, 'LLM_CACHE_TTL', 24 * 60 * 60)
+SEMANTIC_CACHE_THRESHOLD = getattr(settings, 'LLM_SEMANTIC_CACHE_THRESHOLD', 0.92)
+CACHE_BUSY_TIMEOUT = getattr(settings, 'LLM_CACHE_BUSY_TIMEOUT', 0.5)
+# Expired rows are deleted by the next write after this many seconds
+PURGE_INTERVAL = 60 * 60
+
+# sqlite3 connections cannot be shared across threads, so keep one per thread
+_local = threading.local()
+_last_purge = 0.0
+
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Return the cache connection for the current thread, creating the tables on first use.
+
+    The database runs in WAL mode, so readers never wait for a writer, and writers
+    give up after CACHE_BUSY_TIMEOUT instead of stalling the request; a skipped
+    cache write only costs a later LLM call.
+    """
+    connection = getattr(_local, 'connection', None)
+    if connection is None:
+        connection = sqlite3.connect(CACHE_PATH, timeout=CACHE_BUSY_TIMEOUT)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, embedding BLOB NOT NULL, "
+            "response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS llm_cache_created_at ON llm_cache (created_at)")
+        connection.execute("CREATE INDEX IF NOT EXISTS semantic_cache_created_at ON semantic_cache (created_at)")
+        connection.commit()
+        _local.connection = connection
+    return connection
+
+
+def _purge_expired(connection: sqlite3.Connection) -> None:
+    """Delete expired entries, at most once per PURGE_INTERVAL; the caller commits."""
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < PURGE_INTERVAL:
+        return
+
+    _last_purge = now
+    min_created_at = int(now) - CACHE_TTL
+    connection.execute("DELETE FROM llm_cache WHERE created_at < ?", (min_created_at,))
+    connection.execute("DELETE FROM semantic_cache WHERE created_at < ?", (min_created_at,))
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase the prompt and collapse whitespace so trivially different prompts share a key."""
+    return re.sub(r"\s+", " ", prompt.lower()).strip()
+
+
+def make_cache_key(model: str, prompt: str) -> str:
+    """
+    Build a deterministic cache key for a prompt.
+
+    Args:
+        model: The LLM model name
+        prompt: The prompt sent to the LLM
+
+    Returns:
+        str: Hex encoded SHA256 digest
+    """
+    return hashlib.sha256(f"{model}:{normalize_prompt(prompt)}".encode()).hexdigest()
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """
+    Look up a cached LLM response.
+
+    Args:
+        key: Cache key from make_cache_key
+
+    Returns:
+        The cached response, or None on a miss or if the entry has expired
+    """
+    try:
+        row = _get_connection().execute(
+            "SELECT response FROM llm_cache WHERE key = ? AND created_at >= ?",
+            (key, int(time.time()) - CACHE_TTL)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"LLM cache lookup failed: {str(e)}")
+        return None
+    return row[0] if row else None
+
+
+def store_response(key: str, response: str) -> None:
+    """
+    Store an LLM response in the cache, replacing any previous entry.
+
+    Args:
+        key: Cache key from make_cache_key
+        response: Raw response content from the LLM
+    """
+    try:
+        connection = _get_connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+            (key, response, int(time.time()))
+        )
+        _purge_expired(connection)
+        connection.commit()
+    except sqlite3.Error as e:
+        print(f"LLM cache write failed: {str(e)}")
+
+
+class _SemanticIndex:
+    """
+    In-memory copy of the unexpired semantic cache embeddings.
+
+    Vectors are stored L2-normalized, so cosine similarity is a single matrix-vector
+    product. Rows written by other processes are appended incrementally by id into
+    buffers that grow geometrically, and expired rows are dropped on every refresh,
+    so memory is bounded by the entries written within CACHE_TTL.
+    """
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.created_at = np.empty(0, dtype=np.int64)
+        self.embeddings = None
+        self.size = 0
+        self.last_id = 0
+        self.lock = threading.Lock()
+
+    def _drop_expired(self, min_created_at: int) -> None:
+        keep = self.created_at[:self.size] >= min_created_at
+        if keep.all():
+            return
+
+        count = int(keep.sum())
+        self.ids[:count] = self.ids[:self.size][keep]
+        self.created_at[:count] = self.created_at[:self.size][keep]
+        self.embeddings[:count] = self.embeddings[:self.size][keep]
+        self.size = count
+
+    def _reserve(self, capacity: int, dimensions: int) -> None:
+        if capacity <= len(self.ids):
+            return
+
+        # Doubling keeps appends amortized O(1) instead of copying the matrix every refresh
+        capacity = max(capacity, 2 * len(self.ids))
+        ids = np.empty(capacity, dtype=np.int64)
+        created_at = np.empty(capacity, dtype=np.int64)
+        embeddings = np.empty((capacity, dimensions), dtype=np.float32)
+        ids[:self.size] = self.ids[:self.size]
+        created_at[:self.size] = self.created_at[:self.size]
+        if self.embeddings is not None:
+            embeddings[:self.size] = self.embeddings[:self.size]
+        self.ids, self.created_at, self.embeddings = ids, created_at, embeddings
+
+    def refresh(self, connection: sqlite3.Connection, min_created_at: int) -> None:
+        """Drop expired entries and load the unexpired rows added since the last refresh."""
+        self._drop_expired(min_created_at)
+        rows = connection.execute(
+            "SELECT id, embedding, created_at FROM semantic_cache WHERE id > ? AND created_at >= ? ORDER BY id",
+            (self.last_id, min_created_at)
+        ).fetchall()
+        if not rows:
+            return
+
+        start, stop = self.size, self.size + len(rows)
+        self._reserve(stop, len(rows[0][1]) // np.dtype(np.float32).itemsize)
+        for position, row in enumerate(rows, start):
+            self.embeddings[position] = np.frombuffer(row[1], dtype=np.float32)
+        self.ids[start:stop] = [row[0] for row in rows]
+        self.created_at[start:stop] = [row[2] for row in rows]
+        self.size = stop
+        self.last_id = rows[-1][0]
+
+    def search(self, embedding: np.ndarray):
+        """Return (id, similarity) of the closest entry, or None if the index is empty."""
+        if not self.size:
+            return None
+
+        similarities = self.embeddings[:self.size] @ embedding
+        best = int(np.argmax(similarities))
+        return int(self.ids[best]), float(similarities[best])
+
+
+_semantic_index = _SemanticIndex()
+
+
+def _normalize_embedding(embedding: List[float]) -> np.ndarray:
+    """Convert an embedding to a unit-length float32 vector."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def get_semantic_match(embedding: List[float]) -> Optional[Dict[str, Any]]:
+    """
+    Find cached extraction data for a resume with a near-identical embedding.
+
+    Args:
+        embedding: Embedding of the resume text
+
+    Returns:
+        The cached extraction data if an unexpired entry has cosine similarity of at
+        least SEMANTIC_CACHE_THRESHOLD, otherwise None
+    """
+    try:
+        connection = _get_connection()
+        with _semantic_index.lock:
+            _semantic_index.refresh(connection, int(time.time()) - CACHE_TTL)
+            match = _semantic_index.search(_normalize_embedding(embedding))
+
+        if match is None or match[1] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+
+        row = connection.execute("SELECT response FROM semantic_cache WHERE id = ?", (match[0],)).fetchone()
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Semantic cache lookup failed: {str(e)}")
+        return None
+    return json.loads(row[0]) if row else None
+
+
+def store_semantic_match(embedding: List[float], extracted_data: Dict[str, Any]) -> None:
+    """
+    Store extraction data under the embedding of its resume text.
+
+    Args:
+        embedding: Embedding of the resume text
+        extracted_data: Normalized extraction data for the resume
+    """
+    try:
+        connection = _get_connection()
+        connection.execute(
+            "INSERT INTO semantic_cache (embedding, response, created_at) VALUES (?, ?, ?)",
+            (_normalize_embedding(embedding).tobytes(), json.dumps(extracted_data), int(time.time()))
+        )
+        _purge_expired(connection)
+        connection.commit()
+    except sqlite3.Error as e:
+        print(f"Semantic cache write failed: {str(e)}")
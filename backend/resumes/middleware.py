@@ -0,0 +1,101 @@
+"""
+Middleware for the resumes app.
+This module turns errors the API views do not handle themselves into JSON responses,
+so the views only catch the exceptions they can act on, and compresses responses that
+async views stream.
+"""
+
+import zlib
+import brotli
+import zstandard
+from compression_middleware.middleware import CompressionMiddleware, compressor
+from django.core.exceptions import BadRequest, PermissionDenied, SuspiciousOperation
+from django.http import Http404
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework import status
+
+from .views import json_response
+
+API_PATH_PREFIX = '/api/'
+# Client errors Django already answers with a 400, 403 or 404
+CLIENT_ERROR_EXCEPTIONS = (SuspiciousOperation, BadRequest, PermissionDenied, Http404)
+
+
+class _BrotliStreamCompressor:
+    """Brotli compressor with the compress()/flush() interface of zlib and zstandard."""
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=4)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+# Incremental compressors per encoding, at the levels compression_middleware uses
+STREAM_COMPRESSORS = {
+    "zstd": lambda: zstandard.ZstdCompressor(level=7).compressobj(),
+    "br": _BrotliStreamCompressor,
+    "gzip": lambda: zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+}
+
+
+async def _compress_async_stream(streaming_content, stream_compressor):
+    async for chunk in streaming_content:
+        compressed = stream_compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield stream_compressor.flush()
+
+
+class AsyncStreamingCompressionMiddleware(CompressionMiddleware):
+    """
+    CompressionMiddleware that also compresses responses streamed by async views.
+
+    The library compresses streaming content with sync generators, which cannot
+    consume the async iterator of a StreamingHttpResponse served under ASGI.
+    """
+
+    def process_response(self, request, response):
+        if not (response.streaming and response.is_async) or response.has_header("Content-Encoding"):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = compressor(request.META.get("HTTP_ACCEPT_ENCODING", ""))[0]
+        if encoding not in STREAM_COMPRESSORS:
+            return response
+
+        response.streaming_content = _compress_async_stream(
+            response.streaming_content, STREAM_COMPRESSORS[encoding]()
+        )
+        del response["Content-Length"]
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
+
+
+class JsonExceptionMiddleware(MiddlewareMixin):
+    """
+    Return unhandled exceptions raised by API views as a 500 JSON error.
+
+    Client errors (e.g. an upload over DATA_UPLOAD_MAX_NUMBER_FILES) are left to
+    Django, which answers them with their own 4xx status.
+
+    MiddlewareMixin keeps it usable in both sync and async request handling, so the
+    async views are not forced onto a thread.
+    """
+
+    def process_exception(self, request, exception):
+        if not request.path.startswith(API_PATH_PREFIX) or isinstance(exception, CLIENT_ERROR_EXCEPTIONS):
+            return None
+
+        print(f"Unhandled error in {request.path}: {str(exception)}")
+        return json_response(
+            {"error": f"Internal server error: {str(exception)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
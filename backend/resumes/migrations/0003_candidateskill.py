@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-15 06:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_candidate_skills(apps, schema_editor):
+    CandidateProfile = apps.get_model('resumes', 'CandidateProfile')
+    CandidateSkill = apps.get_model('resumes', 'CandidateSkill')
+    CandidateSkill.objects.bulk_create([
+        CandidateSkill(candidate=profile, name=name)
+        for profile in CandidateProfile.objects.only('id', 'skills').iterator()
+        for name in {skill.strip().lower()[:64] for skill in profile.skills if skill.strip()}
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0002_remove_candidateprofile_email_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index', to='resumes.candidateprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['name', 'candidate'], name='candidate_skill_name_idx')],
+                'constraints': [models.UniqueConstraint(fields=('candidate', 'name'), name='unique_candidate_skill')],
+            },
+        ),
+        migrations.RunPython(backfill_candidate_skills, migrations.RunPython.noop),
+    ]
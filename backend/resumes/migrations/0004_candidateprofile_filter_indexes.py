@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-15 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0003_candidateskill'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['seniority', 'qualifications', '-created_at'], name='candidate_sen_qual_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['qualifications', '-created_at'], name='candidate_qual_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['fe_score'], name='candidate_fe_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['be_score'], name='candidate_be_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['-created_at', '-id'], name='candidate_created_idx'),
+        ),
+    ]
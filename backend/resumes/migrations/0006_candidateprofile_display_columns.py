@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-15 06:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0005_candidateprofile_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='qualifications_display',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(qualifications='bachelors', then=models.Value('Bachelors')), models.When(qualifications='masters', then=models.Value('Masters')), models.When(qualifications='phd', then=models.Value('PhD')), models.When(qualifications='diploma', then=models.Value('Diploma')), models.When(qualifications='certification', then=models.Value('Certification')), models.When(qualifications='high_school', then=models.Value('High School')), default=models.F('qualifications'), output_field=models.CharField(max_length=20)), output_field=models.CharField(max_length=20)),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='seniority_display',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(seniority='junior', then=models.Value('Junior')), models.When(seniority='mid', then=models.Value('Mid')), models.When(seniority='senior', then=models.Value('Senior')), models.When(seniority='lead', then=models.Value('Lead')), models.When(seniority='principal', then=models.Value('Principal')), default=models.F('seniority'), output_field=models.CharField(max_length=20)), output_field=models.CharField(max_length=20)),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 import uuid
 
 # Create your models here.
@@ -18,6 +18,35 @@ class QualificationChoices(models.TextChoices):
     DIPLOMA = 'diploma', 'Diploma'
     CERTIFICATION = 'certification', 'Certification'
 
+# Display strings returned (and accepted as filter values) by the candidates API,
+# keyed by the stored value
+SENIORITY_DISPLAY = {
+    SeniorityChoices.JUNIOR: 'Junior',
+    SeniorityChoices.MID: 'Mid',
+    SeniorityChoices.SENIOR: 'Senior',
+    SeniorityChoices.LEAD: 'Lead',
+    SeniorityChoices.PRINCIPAL: 'Principal',
+}
+
+QUALIFICATIONS_DISPLAY = {
+    QualificationChoices.BACHELORS: 'Bachelors',
+    QualificationChoices.MASTERS: 'Masters',
+    QualificationChoices.PHD: 'PhD',
+    QualificationChoices.DIPLOMA: 'Diploma',
+    QualificationChoices.CERTIFICATION: 'Certification',
+    QualificationChoices.HIGH_SCHOOL: 'High School',
+}
+
+
+def _display_expression(field_name, display_strings):
+    """Map a choice column to its display string in SQL; unknown values are passed through."""
+    return models.Case(
+        *(models.When(**{field_name: value}, then=models.Value(display)) for value, display in display_strings.items()),
+        default=models.F(field_name),
+        output_field=models.CharField(max_length=20)
+    )
+
+
 class CandidateProfile(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
@@ -34,11 +63,104 @@ class CandidateProfile(models.Model):
         choices=QualificationChoices.choices,
         default=QualificationChoices.BACHELORS
     )
+    # Computed by the database on write, so listings read display strings verbatim
+    seniority_display = models.GeneratedField(
+        expression=_display_expression('seniority', SENIORITY_DISPLAY),
+        output_field=models.CharField(max_length=20),
+        db_persist=True
+    )
+    qualifications_display = models.GeneratedField(
+        expression=_display_expression('qualifications', QUALIFICATIONS_DISPLAY),
+        output_field=models.CharField(max_length=20),
+        db_persist=True
+    )
+    # Hash of the uploaded PDF bytes (see resume_cache.hash_content), so an identical
+    # upload returns the existing profile; null for profiles created without a file
+    content_hash = models.CharField(max_length=32, unique=True, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        # Match the get_candidates filters; equality columns lead and the listing order
+        # (newest first) follows so filtered pages can be read without a sort
+        indexes = [
+            models.Index(fields=['seniority', 'qualifications', '-created_at'], name='candidate_sen_qual_idx'),
+            models.Index(fields=['qualifications', '-created_at'], name='candidate_qual_idx'),
+            models.Index(fields=['fe_score'], name='candidate_fe_score_idx'),
+            models.Index(fields=['be_score'], name='candidate_be_score_idx'),
+            models.Index(fields=['-created_at', '-id'], name='candidate_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - FE:{self.fe_score} BE:{self.be_score}"
+
+    def save(self, *args, **kwargs):
+        # One transaction, so the profile and its skill rows change together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.skill_index.all().delete()
+            CandidateSkill.objects.bulk_create(CandidateSkill.for_profiles([self]))
+
+    @classmethod
+    def from_parsed_data(cls, parsed_data, content_hash=None):
+        """Build an unsaved profile from the dict returned by the resume parser."""
+        return cls(
+            content_hash=content_hash,
+            name=parsed_data.get('name', 'Unknown'),
+            skills=parsed_data.get('skills', []),
+            fe_score=parsed_data.get('fe_score', 0),
+            be_score=parsed_data.get('be_score', 0),
+            seniority=parsed_data.get('seniority', SeniorityChoices.JUNIOR),
+            qualifications=parsed_data.get('qualifications', QualificationChoices.BACHELORS)
+        )
+
+    def to_candidate_data(self):
+        """Serialize the profile as returned by the resume processing endpoints."""
+        return {
+            "name": self.name,
+            "skills": self.skills,
+            "fe_score": self.fe_score,
+            "be_score": self.be_score,
+            "seniority": self.seniority,
+            "qualifications": self.qualifications
+        }
+
+
+def normalize_skill(skill):
+    """Normalize a skill name for indexing and lookups: trimmed and lowercased."""
+    return skill.strip().lower()[:CandidateSkill.NAME_MAX_LENGTH]
+
+
+class CandidateSkill(models.Model):
+    """
+    One normalized skill of a candidate.
+
+    Mirrors CandidateProfile.skills so skill filters are an indexed lookup on this
+    table instead of a LIKE over the serialized JSON. Rows are rewritten on every
+    CandidateProfile.save(); bulk_create() callers must create them with for_profiles().
+    """
+    NAME_MAX_LENGTH = 64
+
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name='skill_index')
+    name = models.CharField(max_length=NAME_MAX_LENGTH)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['candidate', 'name'], name='unique_candidate_skill')
+        ]
+        indexes = [
+            models.Index(fields=['name', 'candidate'], name='candidate_skill_name_idx')
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def for_profiles(cls, profiles):
+        """Build the unsaved skill rows for the given (saved) profiles."""
+        return [
+            cls(candidate=profile, name=name)
+            for profile in profiles
+            for name in {normalize_skill(skill) for skill in profile.skills if skill.strip()}
+        ]
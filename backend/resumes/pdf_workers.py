@@ -0,0 +1,25 @@
+"""
+PDF worker module.
+This module holds the text extraction functions run in the PDF worker processes. It
+must not import Django or the rest of the app: workers are started with the spawn
+method, which imports this module in a fresh interpreter where Django is not set up.
+"""
+
+import pypdfium2 as pdfium
+
+
+def get_page_text(pdf: pdfium.PdfDocument, page_num: int) -> str:
+    """Extract the text of one page, using plain newlines for line breaks."""
+    textpage = pdf[page_num].get_textpage()
+    return textpage.get_text_range().replace("\r\n", "\n")
+
+
+def extract_document_text(pdf_bytes: bytes, max_pages: int) -> str:
+    """
+    Extract the text of the first max_pages pages of a document in a worker process.
+
+    Worker processes are single-threaded, so no PDFium lock is needed here.
+    """
+    with pdfium.PdfDocument(pdf_bytes) as pdf:
+        page_count = min(len(pdf), max_pages)
+        return "\n".join(get_page_text(pdf, page_num) for page_num in range(page_count)).strip()
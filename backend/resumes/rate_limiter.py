@@ -0,0 +1,64 @@
+"""
+Rate limiter module.
+This module provides an asyncio token bucket used to keep concurrent LLM calls under
+the provider's requests-per-minute and tokens-per-minute limits.
+"""
+
+import time
+import asyncio
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket limiting both request count and token usage per minute.
+
+    Capacity refills continuously, so bursts up to the per-minute limit are allowed
+    and sustained throughput settles at the configured rate.
+    """
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_requests = float(max_requests_per_minute)
+        self.available_tokens = float(max_tokens_per_minute)
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the capacity earned since the last update, capped at one minute's worth."""
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_requests = min(
+            self.max_requests_per_minute,
+            self.available_requests + elapsed * self.max_requests_per_minute / 60.0
+        )
+        self.available_tokens = min(
+            self.max_tokens_per_minute,
+            self.available_tokens + elapsed * self.max_tokens_per_minute / 60.0
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until one request and the given number of tokens are available.
+
+        Args:
+            tokens: Estimated tokens consumed by the request (prompt + completion)
+        """
+        # A single request larger than the whole budget would otherwise wait forever
+        tokens = min(tokens, self.max_tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+
+                missing_requests = max(0.0, 1 - self.available_requests)
+                missing_tokens = max(0.0, tokens - self.available_tokens)
+                await asyncio.sleep(max(
+                    missing_requests * 60.0 / self.max_requests_per_minute,
+                    missing_tokens * 60.0 / self.max_tokens_per_minute
+                ))
@@ -0,0 +1,55 @@
+"""
+Parsed resume cache module.
+This module caches resume parser output in Django's cache, keyed by a hash of the
+uploaded PDF bytes, so re-uploading an identical file skips PDF parsing and the LLM.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+from django.conf import settings
+from django.core.cache import cache
+from blake3 import blake3
+
+CACHE_TTL = getattr(settings, 'PARSED_RESUME_CACHE_TTL', 24 * 60 * 60)
+
+
+def hash_content(content: bytes) -> str:
+    """
+    Hash the raw bytes of an uploaded resume.
+
+    Args:
+        content: The PDF file content
+
+    Returns:
+        str: Hex encoded 128-bit BLAKE3 digest, also stored as CandidateProfile.content_hash
+    """
+    # BLAKE3 is SIMD-accelerated and can spread large inputs over several threads,
+    # several times faster than BLAKE2b on multi-megabyte PDFs
+    return blake3(content, max_threads=blake3.AUTO).hexdigest(length=16)
+
+
+def _make_cache_key(content_hash: str) -> str:
+    return f"resume:{content_hash}"
+
+
+def get_parsed_data(content_hash: str) -> Optional[Dict[str, Any]]:
+    """Return the cached parser output for the content hash, or None on a miss."""
+    return cache.get(_make_cache_key(content_hash))
+
+
+def get_many_parsed_data(content_hashes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Return the cached parser output for each content hash that has an entry."""
+    keys = {_make_cache_key(content_hash): content_hash for content_hash in content_hashes}
+    return {keys[key]: parsed_data for key, parsed_data in cache.get_many(keys).items()}
+
+
+def store_parsed_data(content_hash: str, parsed_data: Dict[str, Any]) -> None:
+    """Cache parser output for CACHE_TTL seconds."""
+    cache.set(_make_cache_key(content_hash), parsed_data, CACHE_TTL)
+
+
+def store_many_parsed_data(parsed_data_by_hash: Dict[str, Dict[str, Any]]) -> None:
+    """Cache parser output for several resumes at once."""
+    cache.set_many(
+        {_make_cache_key(content_hash): parsed_data for content_hash, parsed_data in parsed_data_by_hash.items()},
+        CACHE_TTL
+    )
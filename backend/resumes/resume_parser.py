@@ -6,38 +6,151 @@ This module provides functionality to parse PDF resumes and extract structured d
 import re
 import json
 import os
-from typing import Dict, Any, List
-import PyPDF2
+import asyncio
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet
+import pypdfium2 as pdfium
 import openai
+import aiohttp
+import ahocorasick
 from django.conf import settings
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+from . import llm_cache
+from .pdf_workers import get_page_text, extract_document_text
+from .models import SeniorityChoices, QualificationChoices
+from .rate_limiter import TokenBucketRateLimiter
 
 # Configure OpenAI (you can also use other LLM providers)
 openai.api_key = getattr(settings, 'OPENAI_API_KEY', os.environ.get('OPENAI_API_KEY'))
+OPENAI_MODEL = getattr(settings, 'OPENAI_MODEL', 'gpt-3.5-turbo')
+OPENAI_EMBEDDING_MODEL = getattr(settings, 'OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
+SEMANTIC_CACHE_ENABLED = getattr(settings, 'LLM_SEMANTIC_CACHE_ENABLED', True)
+
+# Only the start of the resume is embedded; it carries the identifying content
+EMBEDDING_MAX_CHARS = 8000
+
+# Limits for concurrent LLM calls made by batch_extract
+OPENAI_MAX_CONCURRENCY = getattr(settings, 'OPENAI_MAX_CONCURRENCY', 10)
+OPENAI_MAX_REQUESTS_PER_MINUTE = getattr(settings, 'OPENAI_MAX_REQUESTS_PER_MINUTE', 500)
+OPENAI_MAX_TOKENS_PER_MINUTE = getattr(settings, 'OPENAI_MAX_TOKENS_PER_MINUTE', 200000)
+
+# Kept identical across calls, ahead of the per-field instruction and the resume text
+SYSTEM_PROMPT = (
+    "You are a resume parsing assistant. Extract candidate information and return it as valid JSON. "
+    "The user sends a single question about one field followed by the resume text. "
+    "Answer with ONLY the requested JSON object and no additional text."
+)
+
+# Bulk uploads combine several resumes into one request, answered as {"results": [...]}
+LLM_BATCH_MAX_RESUMES = getattr(settings, 'LLM_BATCH_MAX_RESUMES', 8)
+LLM_BATCH_MAX_INPUT_TOKENS = getattr(settings, 'LLM_BATCH_MAX_INPUT_TOKENS', 8000)
+LLM_BATCH_TOKENS_PER_RESUME = 400
+
+BATCH_SYSTEM_PROMPT = (
+    "You are a resume parsing assistant. The user sends instructions followed by several resumes, "
+    "each introduced by a RESUME n header. Answer with ONLY a JSON object of the form "
+    '{"results": [...]} holding one entry per resume, each with a "resume" field set to the '
+    'number from its header, and no additional text.'
+)
+
+# Transient OpenAI failures are retried with exponential backoff and jitter before the
+# rule-based fallback is used; other errors (bad request, auth) fail immediately
+TRANSIENT_OPENAI_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.Timeout,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+)
+
+# Errors from the LLM call or from a malformed answer; extraction falls back to the
+# rule-based parser on these instead of failing the upload
+LLM_EXTRACTION_ERRORS = (openai.error.OpenAIError, ValueError, KeyError, TypeError, AttributeError)
+
+retry_transient_openai_errors = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=1, max=10),
+    retry=retry_if_exception_type(TRANSIENT_OPENAI_ERRORS),
+    reraise=True
+)
+
+# PDF extraction limits: pages past PDF_MAX_PAGES are ignored. Batch uploads parse each
+# document in its own worker process; a single document is read serially, which beats
+# splitting its pages across workers (each would need its own copy of the PDF)
+PDF_MAX_PAGES = getattr(settings, 'PDF_MAX_PAGES', 50)
+PDF_MAX_WORKERS = getattr(settings, 'PDF_MAX_WORKERS', min(8, os.cpu_count() or 1))
+# Workers are spawned rather than forked: forking a threaded server process is unsafe,
+# and spawn is the default on macOS/Windows (and on Linux from Python 3.14) anyway
+PDF_WORKER_START_METHOD = getattr(settings, 'PDF_WORKER_START_METHOD', 'spawn')
+
+# One keep-alive HTTP session (and its closer) per event loop, shared by every LLM call made on it, so
+# calls reuse pooled connections instead of each opening its own TCP + TLS connection
+_http_sessions = {}
+
+
+class ResumeProcessingError(Exception):
+    """Raised when no candidate data can be extracted from an uploaded resume."""
+
+
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+# PDFium is not thread-safe, so in-process document access is serialized
+_pdfium_lock = threading.Lock()
 
 def process_resume(pdf_file) -> Dict[str, Any]:
     """
     Process a PDF resume file and extract structured data using LLM.
     
     Args:
-        pdf_file: The uploaded PDF file
+        pdf_file: The uploaded PDF file, or its content as bytes
         
     Returns:
         Dict containing extracted resume data
-    """
-    try:
-        # Step 1: Convert PDF to text
-        text_content = extract_text_from_pdf(pdf_file)
         
-        if not text_content.strip():
-            raise Exception("Could not extract text from PDF file")
-        
-        # Step 2: Use LLM to extract structured data
-        extracted_data = extract_data_with_llm(text_content)
+    Raises:
+        ResumeProcessingError: If no text can be extracted from the PDF
+    """
+    # Step 1: Convert PDF to text
+    text_content = extract_text_from_pdf(pdf_file)
+    
+    if not text_content.strip():
+        raise ResumeProcessingError("Could not extract text from PDF file")
+    
+    # Step 2: Use LLM to extract structured data
+    return extract_data_with_llm(text_content)
+
+
+async def process_resume_async(pdf_file) -> Dict[str, Any]:
+    """
+    Async version of process_resume for async views.
+    
+    PDF parsing runs in a worker thread and the LLM calls are awaited, so the
+    event loop stays free to serve other requests while this one waits.
+    
+    Args:
+        pdf_file: The uploaded PDF file, or its content as bytes
         
-        return extracted_data
+    Returns:
+        Dict containing extracted resume data
         
-    except Exception as e:
-        raise Exception(f"Error processing resume: {str(e)}")
+    Raises:
+        ResumeProcessingError: If no text can be extracted from the PDF
+    """
+    # Step 1: Convert PDF to text
+    text_content = await asyncio.to_thread(extract_text_from_pdf, pdf_file)
+    
+    if not text_content.strip():
+        raise ResumeProcessingError("Could not extract text from PDF file")
+    
+    # Step 2: Use LLM to extract structured data
+    return await extract_data_with_llm_async(text_content)
 
 
 def extract_text_from_pdf(pdf_file) -> str:
@@ -45,28 +158,104 @@ def extract_text_from_pdf(pdf_file) -> str:
     Extract text content from PDF file.
     
     Args:
-        pdf_file: The uploaded PDF file
+        pdf_file: The uploaded PDF file, or its content as bytes
         
     Returns:
         str: Extracted text content
+        
+    Raises:
+        ResumeProcessingError: If the file cannot be read or is not a valid PDF
     """
     try:
-        # Reset file pointer to beginning
-        pdf_file.seek(0)
+        if isinstance(pdf_file, bytes):
+            # Already in memory: hand the buffer to PDFium as is, without another copy
+            pdf_bytes = pdf_file
+        else:
+            # Reset file pointer to beginning
+            pdf_file.seek(0)
+            pdf_bytes = pdf_file.read()
         
-        # Create PDF reader object
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        return _extract_text_in_process(pdf_bytes)
         
-        # Extract text from all pages
-        text_content = ""
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text_content += page.extract_text() + "\n"
+    except (pdfium.PdfiumError, OSError) as e:
+        raise ResumeProcessingError(f"Failed to extract text from PDF: {str(e)}") from e
+
+
+async def extract_texts_from_pdfs_async(pdf_contents: List[bytes]) -> List[Any]:
+    """
+    Extract the text of several PDFs at once, for batch uploads.
+    
+    PDFium is serialized within a process, so with a worker pool configured each
+    document is parsed in its own worker process, in parallel; otherwise they are
+    parsed one after another in a worker thread.
+    
+    Args:
+        pdf_contents: Content of each PDF as bytes
         
-        return text_content.strip()
+    Returns:
+        The extracted text of each PDF, or the ResumeProcessingError raised for it,
+        in the same order as pdf_contents
+    """
+    if PDF_MAX_WORKERS < 2 or len(pdf_contents) < 2:
+        extractions = [asyncio.to_thread(extract_text_from_pdf, pdf_bytes) for pdf_bytes in pdf_contents]
+        results = await asyncio.gather(*extractions, return_exceptions=True)
+    else:
+        executor = _get_pdf_executor()
+        extractions = [_extract_text_in_pool(executor, pdf_bytes) for pdf_bytes in pdf_contents]
+        results = await asyncio.gather(*extractions, return_exceptions=True)
         
-    except Exception as e:
-        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+        # A dead worker fails every document still queued on the pool: start a fresh
+        # pool next time and parse those documents in process instead
+        broken = [idx for idx, result in enumerate(results) if isinstance(result, BrokenProcessPool)]
+        if broken:
+            print("PDF worker pool failed, extracting documents in process")
+            _reset_pdf_executor(executor)
+            retried = await asyncio.gather(*(
+                asyncio.to_thread(_extract_text_in_process, pdf_contents[idx]) for idx in broken
+            ), return_exceptions=True)
+            for idx, result in zip(broken, retried):
+                results[idx] = result
+    
+    for idx, result in enumerate(results):
+        if isinstance(result, (pdfium.PdfiumError, OSError)):
+            results[idx] = ResumeProcessingError(f"Failed to extract text from PDF: {str(result)}")
+        elif isinstance(result, BaseException) and not isinstance(result, ResumeProcessingError):
+            raise result
+    return results
+
+
+async def _extract_text_in_pool(executor: ProcessPoolExecutor, pdf_bytes: bytes) -> str:
+    """Extract the text of a whole document in the worker pool; a broken pool raises when awaited."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, extract_document_text, pdf_bytes, PDF_MAX_PAGES)
+
+
+def _extract_text_in_process(pdf_bytes: bytes) -> str:
+    """Extract the text of a whole document in this process, under the PDFium lock."""
+    with _pdfium_lock, pdfium.PdfDocument(pdf_bytes) as pdf:
+        page_count = min(len(pdf), PDF_MAX_PAGES)
+        return "\n".join(get_page_text(pdf, page_num) for page_num in range(page_count)).strip()
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Return the shared PDF worker pool, starting it on first use."""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            _pdf_executor = ProcessPoolExecutor(
+                max_workers=PDF_MAX_WORKERS,
+                mp_context=multiprocessing.get_context(PDF_WORKER_START_METHOD)
+            )
+    return _pdf_executor
+
+
+def _reset_pdf_executor(executor: ProcessPoolExecutor) -> None:
+    """Discard a broken worker pool so the next parallel extraction starts a new one."""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is executor:
+            _pdf_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
 
 
 def extract_data_with_llm(text_content: str) -> Dict[str, Any]:
@@ -76,96 +265,451 @@ def extract_data_with_llm(text_content: str) -> Dict[str, Any]:
     Args:
         text_content: The extracted text from PDF
         
+    Returns:
+        Dict containing structured candidate data
+    """
+    return asyncio.run(extract_data_with_llm_async(text_content))
+
+
+async def extract_data_with_llm_async(text_content: str,
+                                      semaphore: Optional[asyncio.Semaphore] = None,
+                                      rate_limiter: Optional[TokenBucketRateLimiter] = None) -> Dict[str, Any]:
+    """
+    Use LLM to extract structured data from resume text.
+    
+    Each field is extracted by its own small prompt and the calls run in
+    parallel, so latency is that of the slowest field rather than the sum.
+    
+    Args:
+        text_content: The extracted text from PDF
+        semaphore: Optional limit on LLM calls in flight (shared across a batch)
+        rate_limiter: Optional requests/tokens per minute throttle (shared across a batch)
+        
     Returns:
         Dict containing structured candidate data
     """
     try:
-        # Create prompt for LLM
-        prompt = create_extraction_prompt(text_content)
+        field_prompts = [(build_prompt(text_content), max_tokens) for build_prompt, max_tokens in FIELD_PROMPTS]
         
-        # Call OpenAI API (you can replace this with other LLM providers)
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a resume parsing assistant. Extract candidate information and return it as valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=1000
-        )
+        # Near-duplicate resumes (e.g. only the phone number changed) miss the exact
+        # prompt cache, so look them up by embedding similarity before calling the LLM
+        embedding = None
+        if SEMANTIC_CACHE_ENABLED and not await asyncio.to_thread(_all_prompts_cached, field_prompts):
+            embedding = await _embed_text_async(text_content, semaphore, rate_limiter)
+            if embedding is not None:
+                cached_data = await asyncio.to_thread(llm_cache.get_semantic_match, embedding)
+                if cached_data is not None and _matches_resume(cached_data, text_content):
+                    return cached_data
         
-        # Parse LLM response
-        llm_response = response.choices[0].message.content.strip()
+        field_results = await asyncio.gather(*(
+            _complete_json_async(prompt, max_tokens, semaphore, rate_limiter)
+            for prompt, max_tokens in field_prompts
+        ))
         
-        # Extract JSON from response
-        extracted_data = parse_llm_response(llm_response)
+        extracted_data = {}
+        for field_result in field_results:
+            extracted_data.update(field_result)
         
         # Validate and normalize the data
         normalized_data = normalize_extracted_data(extracted_data)
         
+        # Without a name a later hit could not be verified, so such entries are not stored
+        if embedding is not None and normalized_data['name'] != 'Unknown':
+            await asyncio.to_thread(llm_cache.store_semantic_match, embedding, normalized_data)
+        
         return normalized_data
         
-    except Exception as e:
+    except LLM_EXTRACTION_ERRORS as e:
         # Fallback to rule-based extraction if LLM fails
         print(f"LLM extraction failed: {str(e)}, falling back to rule-based extraction")
         return fallback_extraction(text_content)
 
 
-def create_extraction_prompt(text_content: str) -> str:
+def batch_extract(text_contents: List[str]) -> List[Dict[str, Any]]:
     """
-    Create a prompt for LLM to extract candidate information.
+    Extract structured data from many resumes with concurrent LLM calls.
+    
+    Calls are capped at OPENAI_MAX_CONCURRENCY in flight and throttled to the
+    configured requests/tokens per minute, so bulk uploads overlap network
+    latency instead of paying it once per resume.
     
     Args:
-        text_content: The resume text content
+        text_contents: Extracted text of each resume
         
     Returns:
-        str: Formatted prompt for LLM
+        List of structured candidate data, in the same order as text_contents
     """
-    prompt = f"""
-    Please analyze the following resume text and extract candidate information. Return the data as valid JSON with the following structure:
-
-    {{
-        "name": "candidate's full name",
-        "skills": ["list", "of", "technical", "skills"],
-        "seniority": "junior|mid|senior|lead|principal",
-        "qualifications": "high_school|bachelors|masters|phd|diploma|certification"
-    }}
+    return asyncio.run(batch_extract_async(text_contents))
 
-    Guidelines:
-    1. For seniority: Determine based on job titles, years of experience, and responsibilities
-    2. For qualifications: Extract the highest educational qualification
-    3. For skills: Focus on technical skills, programming languages, frameworks, tools
-    4. Return ONLY the JSON object, no additional text
 
-    Resume text:
-    {text_content}
+async def batch_extract_async(text_contents: List[str]) -> List[Dict[str, Any]]:
     """
-    return prompt
+    Async version of batch_extract for async views.
+    
+    Args:
+        text_contents: Extracted text of each resume
+        
+    Returns:
+        List of structured candidate data, in the same order as text_contents
+    """
+    semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    rate_limiter = TokenBucketRateLimiter(OPENAI_MAX_REQUESTS_PER_MINUTE, OPENAI_MAX_TOKENS_PER_MINUTE)
+    
+    groups = _group_resumes(text_contents)
+    group_results = await asyncio.gather(*(
+        _extract_group_async([text_contents[idx] for idx in group], semaphore, rate_limiter)
+        for group in groups
+    ))
+    
+    results = [None] * len(text_contents)
+    for group, extracted in zip(groups, group_results):
+        for idx, extracted_data in zip(group, extracted):
+            results[idx] = extracted_data
+    return results
 
 
-def parse_llm_response(llm_response: str) -> Dict[str, Any]:
+def _group_resumes(text_contents: List[str]) -> List[List[int]]:
+    """
+    Split resumes into consecutive groups that fit one combined request.
+    
+    Each group holds at most LLM_BATCH_MAX_RESUMES resumes and roughly
+    LLM_BATCH_MAX_INPUT_TOKENS input tokens; a resume too large to share a
+    request ends up in a group of its own.
+    
+    Returns:
+        Lists of indices into text_contents
+    """
+    groups = []
+    current, current_tokens = [], 0
+    for idx, text_content in enumerate(text_contents):
+        tokens = len(text_content) // 4
+        if current and (len(current) >= LLM_BATCH_MAX_RESUMES or current_tokens + tokens > LLM_BATCH_MAX_INPUT_TOKENS):
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(idx)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def _extract_group_async(text_contents: List[str], semaphore: asyncio.Semaphore,
+                               rate_limiter: TokenBucketRateLimiter) -> List[Dict[str, Any]]:
+    """
+    Extract a group of resumes with one combined LLM request.
+    
+    Results are matched to resumes by the number each one echoes, not by position.
+    Single resumes, groups whose combined answer fails or does not number one result
+    per resume, and results whose name does not appear in their resume go through
+    the per-resume extraction instead.
+    
+    Returns:
+        List of structured candidate data, in the same order as text_contents
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(text_contents)
+    if len(text_contents) > 1:
+        try:
+            extracted = await _complete_json_async(
+                create_batch_prompt(text_contents),
+                LLM_BATCH_TOKENS_PER_RESUME * len(text_contents),
+                semaphore,
+                rate_limiter,
+                system_prompt=BATCH_SYSTEM_PROMPT,
+                expected_results=len(text_contents)
+            )
+            for extracted_data in extracted['results']:
+                candidate_data = normalize_extracted_data(extracted_data)
+                position = extracted_data['resume'] - 1
+                # A known name missing from the resume means the answer mixed resumes up
+                if candidate_data['name'] == 'Unknown' or _matches_resume(candidate_data, text_contents[position]):
+                    results[position] = candidate_data
+        except LLM_EXTRACTION_ERRORS as e:
+            print(f"Batched LLM extraction failed: {str(e)}, extracting resumes individually")
+    
+    pending = [position for position, candidate_data in enumerate(results) if candidate_data is None]
+    individual_results = await asyncio.gather(*(
+        extract_data_with_llm_async(text_contents[position], semaphore, rate_limiter)
+        for position in pending
+    ))
+    for position, candidate_data in zip(pending, individual_results):
+        results[position] = candidate_data
+    return results
+
+
+async def _complete_json_async(prompt: str, max_tokens: int, semaphore: Optional[asyncio.Semaphore],
+                               rate_limiter: Optional[TokenBucketRateLimiter],
+                               system_prompt: str = SYSTEM_PROMPT,
+                               expected_results: Optional[int] = None) -> Dict[str, Any]:
     """
-    Parse the LLM response and extract JSON data.
+    Run one prompt through the LLM (or the cache) and parse the JSON answer.
     
     Args:
-        llm_response: Raw response from LLM
+        prompt: The prompt to send
+        max_tokens: Completion token limit for this prompt
+        semaphore: Optional limit on LLM calls in flight
+        rate_limiter: Optional requests/tokens per minute throttle
+        system_prompt: System message sent with the prompt
+        expected_results: For combined prompts, the number of entries the
+            "results" list must hold, numbered 1 to expected_results by their
+            "resume" field
         
     Returns:
-        Dict containing parsed data
+        Dict parsed from the LLM response
+        
+    Raises:
+        ValueError: If the answer is not valid JSON, a field has the wrong type, or a
+            combined answer does not hold one entry per resume number
+    """
+    # Serve repeated prompts from the cache instead of calling the LLM again; SQLite
+    # I/O runs in a worker thread to keep the event loop free
+    cache_key = llm_cache.make_cache_key(OPENAI_MODEL, prompt)
+    llm_response = await asyncio.to_thread(llm_cache.get_cached_response, cache_key)
+    if llm_response is not None:
+        try:
+            return _parse_llm_answer(llm_response, expected_results)
+        except ValueError:
+            # Stored before answers were validated; ask the LLM again
+            pass
+    
+    async with semaphore or contextlib.nullcontext():
+        response = await _create_chat_completion_async(prompt, max_tokens, rate_limiter, system_prompt)
+    llm_response = response.choices[0].message.content.strip()
+    parsed_data = _parse_llm_answer(llm_response, expected_results)
+    
+    # Only cache responses that passed validation, so a bad answer is not replayed
+    await asyncio.to_thread(llm_cache.store_response, cache_key, llm_response)
+    
+    return parsed_data
+
+
+def _parse_llm_answer(llm_response: str, expected_results: Optional[int]) -> Dict[str, Any]:
+    """
+    Parse an LLM answer and check it has the shape normalize_extracted_data expects.
+    
+    Raises:
+        ValueError: If the answer is not a JSON object of correctly typed fields
+    """
+    # JSON mode guarantees the response is a single JSON object
+    parsed_data = json.loads(llm_response)
+    if not isinstance(parsed_data, dict):
+        raise ValueError("LLM response is not a JSON object")
+    
+    if expected_results is None:
+        _check_field_types(parsed_data)
+        return parsed_data
+    
+    results = parsed_data.get('results')
+    if not isinstance(results, list) or not all(isinstance(result, dict) for result in results) \
+            or sorted(_result_number(result) for result in results) != list(range(1, expected_results + 1)):
+        raise ValueError(f"Expected results numbered 1 to {expected_results} in combined LLM response")
+    for result in results:
+        _check_field_types(result)
+    return parsed_data
+
+
+def _check_field_types(extracted_data: Dict[str, Any]) -> None:
+    """Raise ValueError if a field present in the answer has the wrong JSON type."""
+    for field in ('name', 'seniority', 'qualifications'):
+        if field in extracted_data and not isinstance(extracted_data[field], str):
+            raise ValueError(f"LLM returned a non-string {field}")
+    
+    skills = extracted_data.get('skills', [])
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        raise ValueError("LLM returned skills that are not a list of strings")
+
+
+def _result_number(result: Dict[str, Any]) -> int:
+    """Return the resume number a combined answer entry echoes, or 0 if it is missing or not an integer."""
+    number = result.get('resume')
+    return number if type(number) is int else 0
+
+
+async def _get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the shared HTTP session for the running event loop, creating it on first use.
+    
+    Under ASGI the loop, and so the session, lives as long as the worker process;
+    asyncio.run() callers (batch uploads, Celery tasks) get one session per run.
     """
+    loop = asyncio.get_running_loop()
+    session, _ = _http_sessions.get(loop, (None, None))
+    if session is None or session.closed:
+        session = aiohttp.ClientSession()
+        # Event loops close their open async generators when they shut down, which
+        # closes the session cleanly however the loop was started
+        closer = _close_on_loop_shutdown(loop, session)
+        _http_sessions[loop] = (session, closer)
+        await closer.__anext__()
+    return session
+
+
+async def _close_on_loop_shutdown(loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession):
     try:
-        # Try to find JSON in the response
-        json_start = llm_response.find('{')
-        json_end = llm_response.rfind('}') + 1
-        
-        if json_start != -1 and json_end > json_start:
-            json_str = llm_response[json_start:json_end]
-            return json.loads(json_str)
-        else:
-            raise Exception("No valid JSON found in LLM response")
-            
-    except json.JSONDecodeError as e:
-        raise Exception(f"Failed to parse JSON from LLM response: {str(e)}")
+        yield
+    finally:
+        _http_sessions.pop(loop, None)
+        await session.close()
+
+
+@retry_transient_openai_errors
+async def _create_chat_completion_async(prompt: str, max_tokens: int,
+                                        rate_limiter: Optional[TokenBucketRateLimiter],
+                                        system_prompt: str = SYSTEM_PROMPT):
+    """Call the chat completion API, taking rate limit capacity for every attempt."""
+    if rate_limiter:
+        await rate_limiter.acquire(_estimate_tokens(prompt, max_tokens, system_prompt))
+    openai.aiosession.set(await _get_http_session())
+    # Call OpenAI API (you can replace this with other LLM providers)
+    return await openai.ChatCompletion.acreate(**_completion_kwargs(prompt, max_tokens, system_prompt))
+
+
+@retry_transient_openai_errors
+async def _create_embedding_async(embedding_input: str, rate_limiter: Optional[TokenBucketRateLimiter]):
+    """Call the embeddings API, taking rate limit capacity for every attempt."""
+    if rate_limiter:
+        await rate_limiter.acquire(len(embedding_input) // 4)
+    openai.aiosession.set(await _get_http_session())
+    return await openai.Embedding.acreate(model=OPENAI_EMBEDDING_MODEL, input=embedding_input)
+
+
+def _all_prompts_cached(field_prompts: List[tuple]) -> bool:
+    """
+    Check whether every field prompt can be answered from the exact prompt cache.
+    
+    Blocking SQLite I/O; async callers run it with asyncio.to_thread().
+    """
+    return all(
+        llm_cache.get_cached_response(llm_cache.make_cache_key(OPENAI_MODEL, prompt)) is not None
+        for prompt, _ in field_prompts
+    )
+
+
+async def _embed_text_async(text_content: str, semaphore: Optional[asyncio.Semaphore],
+                            rate_limiter: Optional[TokenBucketRateLimiter]) -> Optional[List[float]]:
+    """
+    Embed the whitespace-normalized resume text for the semantic cache.
+    
+    Returns:
+        The embedding vector, or None if the embedding call failed
+    """
+    embedding_input = re.sub(r"\s+", " ", text_content).strip()[:EMBEDDING_MAX_CHARS]
+    try:
+        async with semaphore or contextlib.nullcontext():
+            response = await _create_embedding_async(embedding_input, rate_limiter)
+        return response['data'][0]['embedding']
+    except LLM_EXTRACTION_ERRORS as e:
+        print(f"Embedding failed: {str(e)}, skipping semantic cache")
+        return None
+
+
+def _matches_resume(cached_data: Dict[str, Any], text_content: str) -> bool:
+    """
+    Cheap re-verification of a semantic cache hit.
+    
+    Similar resumes built from the same template can embed close together, so the
+    cached candidate name must also appear in the new resume text. Entries without
+    a known name cannot be verified and never match.
+    """
+    name = cached_data.get('name', 'Unknown')
+    return name != 'Unknown' and name.lower() in text_content.lower()
+
+
+def _completion_kwargs(prompt: str, max_tokens: int, system_prompt: str = SYSTEM_PROMPT) -> Dict[str, Any]:
+    """Build the chat completion arguments for a prompt."""
+    return {
+        'model': OPENAI_MODEL,
+        'messages': [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        'temperature': 0,
+        'max_tokens': max_tokens,
+        'response_format': {"type": "json_object"}
+    }
+
+
+def _estimate_tokens(prompt: str, max_tokens: int, system_prompt: str = SYSTEM_PROMPT) -> int:
+    """Rough token estimate (~4 characters per token) for rate limiting."""
+    return (len(system_prompt) + len(prompt)) // 4 + max_tokens
+
+
+def _create_field_prompt(text_content: str, instruction: str) -> str:
+    """
+    Build a field prompt with the fixed field instruction first and the resume text last.
+    
+    Each field's prompt then starts the same way for every resume.
+    """
+    return f"{instruction}\n\nResume text:\n{text_content}"
+
+
+def create_basic_prompt(text_content: str) -> str:
+    """Create a prompt asking the LLM for the candidate's name."""
+    return _create_field_prompt(
+        text_content,
+        'Return the candidate\'s full name as JSON: {"name": "full name"}'
+    )
+
+
+def create_skills_prompt(text_content: str) -> str:
+    """Create a prompt asking the LLM for the candidate's technical skills."""
+    return _create_field_prompt(
+        text_content,
+        'List the candidate\'s technical skills (programming languages, frameworks, tools) as JSON: '
+        '{"skills": ["skill", "..."]}. Use short skill names, no descriptions.'
+    )
+
+
+def create_seniority_prompt(text_content: str) -> str:
+    """Create a prompt asking the LLM for the candidate's seniority level."""
+    return _create_field_prompt(
+        text_content,
+        'Determine the candidate\'s seniority from job titles, years of experience and responsibilities. '
+        'Return JSON: {"seniority": "junior|mid|senior|lead|principal"}'
+    )
+
+
+def create_qualification_prompt(text_content: str) -> str:
+    """Create a prompt asking the LLM for the candidate's highest qualification."""
+    return _create_field_prompt(
+        text_content,
+        'Determine the candidate\'s highest educational qualification. '
+        'Return JSON: {"qualifications": "high_school|bachelors|masters|phd|diploma|certification"}'
+    )
+
+
+def create_batch_prompt(text_contents: List[str]) -> str:
+    """
+    Create one prompt asking the LLM for every field of several resumes.
+    
+    The instruction comes first, followed by the numbered resumes.
+    """
+    resumes = "\n---\n".join(
+        f"RESUME {number}:\n{text_content}" for number, text_content in enumerate(text_contents, start=1)
+    )
+    return (
+        'For each resume return {"resume": n, "name": "full name", "skills": ["skill", "..."], '
+        '"seniority": "junior|mid|senior|lead|principal", '
+        '"qualifications": "high_school|bachelors|masters|phd|diploma|certification"}. '
+        'Skills are technical skills (programming languages, frameworks, tools) with short names, '
+        'seniority is judged from job titles, years of experience and responsibilities, and '
+        'qualifications is the highest educational qualification.\n\n'
+        f"{resumes}"
+    )
+
+
+# One (prompt builder, max_tokens) pair per extracted field; the JSON answers are merged
+# into a single record. Skills get a larger budget so long lists are not cut off mid-JSON.
+FIELD_PROMPTS = (
+    (create_basic_prompt, 120),
+    (create_skills_prompt, 300),
+    (create_seniority_prompt, 120),
+    (create_qualification_prompt, 120),
+)
+
+
+# Valid choices, built once from the model so the parser cannot drift from the schema
+VALID_SENIORITIES = frozenset(choice.value for choice in SeniorityChoices)
+VALID_QUALIFICATIONS = frozenset(choice.value for choice in QualificationChoices)
 
 
 def normalize_extracted_data(extracted_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -178,10 +722,6 @@ def normalize_extracted_data(extracted_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict containing normalized data
     """
-    # Valid choices
-    valid_seniorities = ['junior', 'mid', 'senior', 'lead', 'principal']
-    valid_qualifications = ['high_school', 'bachelors', 'masters', 'phd', 'diploma', 'certification']
-    
     # Normalize name
     name = extracted_data.get('name', 'Unknown').strip()
     if not name or name.lower() == 'unknown':
@@ -195,17 +735,16 @@ def normalize_extracted_data(extracted_data: Dict[str, Any]) -> Dict[str, Any]:
     
     # Normalize seniority
     seniority = extracted_data.get('seniority', 'mid').lower().strip()
-    if seniority not in valid_seniorities:
+    if seniority not in VALID_SENIORITIES:
         seniority = 'mid'  # Default fallback
     
     # Normalize qualifications
     qualifications = extracted_data.get('qualifications', 'bachelors').lower().strip()
-    if qualifications not in valid_qualifications:
+    if qualifications not in VALID_QUALIFICATIONS:
         qualifications = 'bachelors'  # Default fallback
     
     # Calculate scores based on skills and seniority
-    fe_score = calculate_fe_score_from_data(skills, seniority)
-    be_score = calculate_be_score_from_data(skills, seniority)
+    fe_score, be_score = calculate_scores_from_data(skills, seniority)
     
     return {
         'name': name,
@@ -217,66 +756,132 @@ def normalize_extracted_data(extracted_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def calculate_fe_score_from_data(skills: List[str], seniority: str) -> int:
-    """Calculate frontend score based on skills and seniority."""
-    fe_skills = [
-        'react', 'angular', 'vue', 'javascript', 'typescript', 'html', 'css',
-        'frontend', 'front-end', 'ui', 'ux', 'responsive', 'bootstrap', 'sass',
-        'webpack', 'babel', 'npm', 'yarn', 'redux', 'mobx', 'jquery', 'next.js',
-        'nuxt.js', 'svelte', 'ember', 'backbone', 'material-ui', 'tailwind'
-    ]
-    
-    score = 0
-    skills_lower = [skill.lower() for skill in skills]
-    
-    # Score based on skills
-    for skill in fe_skills:
-        if any(skill in s for s in skills_lower):
-            score += 10
-    
-    # Bonus for seniority
-    seniority_bonus = {
-        'junior': 5,
-        'mid': 10,
-        'senior': 20,
-        'lead': 30,
-        'principal': 30
-    }
-    score += seniority_bonus.get(seniority, 10)
-    
-    return min(score, 100)
-
-
-def calculate_be_score_from_data(skills: List[str], seniority: str) -> int:
-    """Calculate backend score based on skills and seniority."""
-    be_skills = [
-        'python', 'django', 'flask', 'fastapi', 'node.js', 'express', 'java',
-        'spring', 'c#', '.net', 'ruby', 'rails', 'php', 'laravel', 'go',
-        'rust', 'backend', 'back-end', 'api', 'database', 'sql', 'mongodb',
-        'postgresql', 'mysql', 'redis', 'elasticsearch', 'microservices',
-        'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'serverless', 'graphql',
-        'rest', 'grpc', 'kafka', 'rabbitmq', 'nginx', 'apache'
-    ]
-    
-    score = 0
-    skills_lower = [skill.lower() for skill in skills]
-    
-    # Score based on skills
-    for skill in be_skills:
-        if any(skill in s for s in skills_lower):
-            score += 10
-    
-    # Bonus for seniority
-    seniority_bonus = {
-        'junior': 5,
-        'mid': 10,
-        'senior': 20,
-        'lead': 30,
-        'principal': 30
-    }
-    score += seniority_bonus.get(seniority, 10)
+# Keyword lists used for scoring and rule-based skill detection
+FE_SKILLS = [
+    'react', 'angular', 'vue', 'javascript', 'typescript', 'html', 'css',
+    'frontend', 'front-end', 'ui', 'ux', 'responsive', 'bootstrap', 'sass',
+    'webpack', 'babel', 'npm', 'yarn', 'redux', 'mobx', 'jquery', 'next.js',
+    'nuxt.js', 'svelte', 'ember', 'backbone', 'material-ui', 'tailwind'
+]
+
+BE_SKILLS = [
+    'python', 'django', 'flask', 'fastapi', 'node.js', 'express', 'java',
+    'spring', 'c#', '.net', 'ruby', 'rails', 'php', 'laravel', 'go',
+    'rust', 'backend', 'back-end', 'api', 'database', 'sql', 'mongodb',
+    'postgresql', 'mysql', 'redis', 'elasticsearch', 'microservices',
+    'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'serverless', 'graphql',
+    'rest', 'grpc', 'kafka', 'rabbitmq', 'nginx', 'apache'
+]
+
+COMMON_SKILLS = [
+    'Python', 'JavaScript', 'React', 'Django', 'Node.js', 'Java', 'C++', 'C#',
+    'AWS', 'Docker', 'Kubernetes', 'Machine Learning', 'SQL', 'MongoDB',
+    'Git', 'Linux', 'HTML', 'CSS', 'TypeScript', 'Vue.js', 'Angular',
+    'Flask', 'FastAPI', 'PostgreSQL', 'Redis', 'GraphQL', 'REST API'
+]
+
+SENIORITY_BONUS = {
+    'junior': 5,
+    'mid': 10,
+    'senior': 20,
+    'lead': 30,
+    'principal': 30
+}
+
+
+def _build_automaton(keywords: List[str]) -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton matching the lowercased keywords."""
+    # Integer payloads keep the per-match set insertion cheap
+    automaton = ahocorasick.Automaton(ahocorasick.STORE_INTS)
+    for idx, keyword in enumerate(keywords):
+        automaton.add_word(keyword.lower(), idx)
+    automaton.make_automaton()
+    return automaton
+
+
+# Built once at import; each lookup is a single linear scan over the input
+FE_AUTOMATON = _build_automaton(FE_SKILLS)
+BE_AUTOMATON = _build_automaton(BE_SKILLS)
+
+
+@lru_cache(maxsize=4096)
+def _match_skill(skill: str) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+    """
+    Return the ids of the FE and BE keywords occurring in one skill.
     
-    return min(score, 100)
+    Skill names repeat heavily across resumes ("Python", "React"), so results are
+    memoized and scoring a typical resume is a handful of cache hits.
+    """
+    skill_lower = skill.lower()
+    return (frozenset(idx for _, idx in FE_AUTOMATON.iter(skill_lower)),
+            frozenset(idx for _, idx in BE_AUTOMATON.iter(skill_lower)))
+
+
+# Fallback markers in priority order: the first entry with any marker present wins
+SENIORITY_MARKERS = (
+    ('senior', ('senior', 'sr.')),
+    ('principal', ('principal', 'architect')),
+    ('lead', ('lead',)),
+    ('junior', ('junior', 'entry', 'jr.')),
+)
+
+QUALIFICATION_MARKERS = (
+    ('phd', ('phd', 'doctorate', 'ph.d')),
+    ('masters', ('master', 'mba', 'm.s', 'm.a')),
+    ('bachelors', ('bachelor', 'b.s', 'b.a', 'b.tech')),
+    ('diploma', ('diploma',)),
+    ('certification', ('certificate', 'certification')),
+)
+
+
+def _build_fallback_automaton() -> ahocorasick.Automaton:
+    """
+    Build one automaton over skills and seniority/qualification markers.
+    
+    Each keyword maps to a tuple of (category, rank, value, length) tags, so a single
+    scan of the text yields every feature the fallback needs.
+    """
+    tags = {}
+    for skill in COMMON_SKILLS:
+        tags.setdefault(skill.lower(), []).append(('skills', 0, skill, len(skill)))
+    for category, markers in (('seniority', SENIORITY_MARKERS), ('qualifications', QUALIFICATION_MARKERS)):
+        for rank, (value, keywords) in enumerate(markers):
+            for keyword in keywords:
+                tags.setdefault(keyword, []).append((category, rank, value, len(keyword)))
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_tags in tags.items():
+        automaton.add_word(keyword, tuple(keyword_tags))
+    automaton.make_automaton()
+    return automaton
+
+
+FALLBACK_AUTOMATON = _build_fallback_automaton()
+
+
+def calculate_scores_from_data(skills: List[str], seniority: str) -> Tuple[int, int]:
+    """
+    Calculate frontend and backend scores based on skills and seniority.
+    
+    Each FE/BE keyword found as a substring of any skill adds 10 points to its score
+    (counted once), plus a seniority bonus; both scores are capped at 100.
+    
+    Args:
+        skills: Extracted skills
+        seniority: Normalized seniority level
+        
+    Returns:
+        Tuple of (fe_score, be_score)
+    """
+    fe_matches = set()
+    be_matches = set()
+    for skill in skills:
+        skill_fe, skill_be = _match_skill(skill)
+        fe_matches |= skill_fe
+        be_matches |= skill_be
+    
+    bonus = SENIORITY_BONUS.get(seniority, 10)
+    return min(10 * len(fe_matches) + bonus, 100), min(10 * len(be_matches) + bonus, 100)
 
 
 def fallback_extraction(text_content: str) -> Dict[str, Any]:
@@ -289,13 +894,16 @@ def fallback_extraction(text_content: str) -> Dict[str, Any]:
     Returns:
         Dict containing extracted data using rule-based approach
     """
+    skills, seniority, qualifications = _scan_fallback_features(text_content)
+    fe_score, be_score = calculate_scores_from_data(skills, seniority)
+    
     return {
         'name': _extract_name_fallback(text_content),
-        'skills': _extract_skills_fallback(text_content),
-        'fe_score': _calculate_fe_score_fallback(text_content),
-        'be_score': _calculate_be_score_fallback(text_content),
-        'seniority': _extract_seniority_fallback(text_content),
-        'qualifications': _extract_qualifications_fallback(text_content)
+        'skills': skills,
+        'fe_score': fe_score,
+        'be_score': be_score,
+        'seniority': seniority,
+        'qualifications': qualifications
     }
 
 
@@ -312,64 +920,37 @@ def _extract_name_fallback(text: str) -> str:
     return "Unknown"
 
 
-def _extract_skills_fallback(text: str) -> List[str]:
-    """Extract skills using rule-based approach."""
-    common_skills = [
-        'Python', 'JavaScript', 'React', 'Django', 'Node.js', 'Java', 'C++', 'C#',
-        'AWS', 'Docker', 'Kubernetes', 'Machine Learning', 'SQL', 'MongoDB',
-        'Git', 'Linux', 'HTML', 'CSS', 'TypeScript', 'Vue.js', 'Angular',
-        'Flask', 'FastAPI', 'PostgreSQL', 'Redis', 'GraphQL', 'REST API'
-    ]
-    
-    found_skills = []
-    text_upper = text.upper()
-    
-    for skill in common_skills:
-        if skill.upper() in text_upper:
-            found_skills.append(skill)
+def _scan_fallback_features(text: str) -> Tuple[List[str], str, str]:
+    """
+    Extract skills, seniority and qualifications in a single pass over the text.
     
-    return found_skills
-
-
-def _calculate_fe_score_fallback(text: str) -> int:
-    """Calculate frontend score using rule-based approach."""
-    return calculate_fe_score_from_data(_extract_skills_fallback(text), _extract_seniority_fallback(text))
-
-
-def _calculate_be_score_fallback(text: str) -> int:
-    """Calculate backend score using rule-based approach."""
-    return calculate_be_score_from_data(_extract_skills_fallback(text), _extract_seniority_fallback(text))
-
-
-def _extract_seniority_fallback(text: str) -> str:
-    """Extract seniority using rule-based approach."""
+    Args:
+        text: The resume text content
+        
+    Returns:
+        Tuple of (skills in COMMON_SKILLS order, seniority, qualifications)
+    """
     text_lower = text.lower()
+    skills = set()
+    best_rank = {'seniority': len(SENIORITY_MARKERS), 'qualifications': len(QUALIFICATION_MARKERS)}
     
-    if 'senior' in text_lower or 'sr.' in text_lower:
-        return 'senior'
-    elif 'principal' in text_lower or 'architect' in text_lower:
-        return 'principal'
-    elif 'lead' in text_lower:
-        return 'lead'
-    elif 'junior' in text_lower or 'entry' in text_lower or 'jr.' in text_lower:
-        return 'junior'
-    else:
-        return 'mid'
+    for end, tags in FALLBACK_AUTOMATON.iter(text_lower):
+        for category, rank, value, length in tags:
+            if category == 'skills':
+                # Skills must stand alone as words ("Go" must not match "Google")
+                start = end - length + 1
+                if _is_word_char(text_lower, start - 1) or _is_word_char(text_lower, end + 1):
+                    continue
+                skills.add(value)
+            elif rank < best_rank[category]:
+                best_rank[category] = rank
+    
+    seniority = SENIORITY_MARKERS[best_rank['seniority']][0] if best_rank['seniority'] < len(SENIORITY_MARKERS) else 'mid'
+    qualifications = (QUALIFICATION_MARKERS[best_rank['qualifications']][0]
+                      if best_rank['qualifications'] < len(QUALIFICATION_MARKERS) else 'bachelors')
+    return [skill for skill in COMMON_SKILLS if skill in skills], seniority, qualifications
 
 
-def _extract_qualifications_fallback(text: str) -> str:
-    """Extract qualifications using rule-based approach."""
-    text_lower = text.lower()
-    
-    if 'phd' in text_lower or 'doctorate' in text_lower or 'ph.d' in text_lower:
-        return 'phd'
-    elif 'master' in text_lower or 'mba' in text_lower or 'm.s' in text_lower or 'm.a' in text_lower:
-        return 'masters'
-    elif 'bachelor' in text_lower or 'b.s' in text_lower or 'b.a' in text_lower or 'b.tech' in text_lower:
-        return 'bachelors'
-    elif 'diploma' in text_lower:
-        return 'diploma'
-    elif 'certificate' in text_lower or 'certification' in text_lower:
-        return 'certification'
-    else:
-        return 'bachelors' 
\ No newline at end of file
+def _is_word_char(text: str, index: int) -> bool:
+    """Return True if text[index] exists and is a regex word character."""
+    return 0 <= index < len(text) and (text[index].isalnum() or text[index] == '_')
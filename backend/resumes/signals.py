@@ -0,0 +1,17 @@
+"""
+Signal handlers for the resumes app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import candidate_cache
+from .models import CandidateProfile
+
+
+@receiver(post_save, sender=CandidateProfile)
+@receiver(post_delete, sender=CandidateProfile)
+def invalidate_candidate_cache(sender, **kwargs):
+    """Drop cached candidate listings once the change is committed."""
+    transaction.on_commit(candidate_cache.invalidate)
@@ -0,0 +1,56 @@
+"""
+Background tasks for the resumes app.
+This module provides Celery tasks that parse resumes outside the request cycle.
+"""
+
+from typing import Dict, Any, Optional
+from celery import shared_task
+from django.core.files.storage import default_storage
+from django.db import IntegrityError
+
+from . import resume_cache
+from .models import CandidateProfile
+from .resume_parser import process_resume
+
+
+@shared_task
+def parse_resume_task(path: str, filename: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse a queued resume and save the candidate profile.
+    
+    Transient OpenAI errors are already retried inside the parser before it
+    falls back to rule-based extraction, so the task itself is not retried.
+    
+    Args:
+        path: default_storage path of the uploaded PDF, deleted once processed
+        filename: Original upload name, for logging
+        content_hash: resume_cache.hash_content of the PDF, used to reuse cached parser
+            output and to deduplicate profiles
+        
+    Returns:
+        Dict with the new candidate id and data, stored as the task result
+    """
+    parsed_data = resume_cache.get_parsed_data(content_hash) if content_hash else None
+    try:
+        if parsed_data is None:
+            with default_storage.open(path, 'rb') as pdf_file:
+                parsed_data = process_resume(pdf_file)
+            if content_hash:
+                resume_cache.store_parsed_data(content_hash, parsed_data)
+    finally:
+        default_storage.delete(path)
+    
+    candidate_profile = CandidateProfile.from_parsed_data(parsed_data, content_hash=content_hash)
+    try:
+        candidate_profile.save()
+    except IntegrityError:
+        # The same file was queued twice; keep the profile saved first
+        if not content_hash:
+            raise
+        candidate_profile = CandidateProfile.objects.get(content_hash=content_hash)
+    
+    print(f"Processed queued resume {filename} as candidate {candidate_profile.id}")
+    return {
+        "candidate_id": str(candidate_profile.id),
+        "candidate_data": candidate_profile.to_candidate_data()
+    }
@@ -1,3 +1,637 @@
-from django.test import TestCase
+import io
+import re
+import time
+import random
+import asyncio
+import sqlite3
+import zipfile
+import tempfile
+import threading
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import orjson
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from . import llm_cache, resume_cache, resume_parser, views
+from .body_limit import RequestBodyLimitMiddleware
+from .models import CandidateProfile, CandidateSkill
+from .upload_handlers import MaxFileSizeUploadHandler
+from .resume_parser import (
+    BE_SKILLS, COMMON_SKILLS, FE_SKILLS, SENIORITY_BONUS, calculate_scores_from_data, fallback_extraction
+)
+
+
+# Reference copies of the rule-based fallback before it was fused into one
+# Aho-Corasick scan; the fused version must give the same answers
+REFERENCE_SKILLS_RE = re.compile(
+    r"(?<!\w)(" + "|".join(re.escape(skill) for skill in sorted(COMMON_SKILLS, key=len, reverse=True)) + r")(?!\w)",
+    re.IGNORECASE
+)
+
+
+def reference_skills(text):
+    found = {match.group(1).lower() for match in REFERENCE_SKILLS_RE.finditer(text)}
+    return [skill for skill in COMMON_SKILLS if skill.lower() in found]
+
+
+def reference_seniority(text):
+    text_lower = text.lower()
+    if 'senior' in text_lower or 'sr.' in text_lower:
+        return 'senior'
+    elif 'principal' in text_lower or 'architect' in text_lower:
+        return 'principal'
+    elif 'lead' in text_lower:
+        return 'lead'
+    elif 'junior' in text_lower or 'entry' in text_lower or 'jr.' in text_lower:
+        return 'junior'
+    return 'mid'
+
+
+def reference_qualifications(text):
+    text_lower = text.lower()
+    if 'phd' in text_lower or 'doctorate' in text_lower or 'ph.d' in text_lower:
+        return 'phd'
+    elif 'master' in text_lower or 'mba' in text_lower or 'm.s' in text_lower or 'm.a' in text_lower:
+        return 'masters'
+    elif 'bachelor' in text_lower or 'b.s' in text_lower or 'b.a' in text_lower or 'b.tech' in text_lower:
+        return 'bachelors'
+    elif 'diploma' in text_lower:
+        return 'diploma'
+    elif 'certificate' in text_lower or 'certification' in text_lower:
+        return 'certification'
+    return 'bachelors'
+
+
+MARKER_WORDS = [
+    'senior', 'Sr.', 'principal', 'architect', 'lead', 'leadership', 'junior', 'entry', 'Jr.',
+    'PhD', 'doctorate', 'Ph.D', 'master', 'MBA', 'M.S', 'M.A', 'bachelor', 'B.S', 'B.A',
+    'B.Tech', 'diploma', 'certificate', 'certification',
+]
+NOISE_WORDS = ['engineer', 'Google', 'Javas', 'Gopher', 'react-native', 'x', '2019', 'team', 'C', 'Go']
+SEPARATORS = [' ', '  ', '\n', ', ', '/', '-', '_', '.', '(', ')', '+', '#', '']
+
+
+def random_resume_text(rng):
+    words = rng.choices(COMMON_SKILLS + MARKER_WORDS + NOISE_WORDS, k=rng.randint(0, 40))
+    parts = []
+    for word in words:
+        if rng.random() < 0.3:
+            word = word.upper() if rng.random() < 0.5 else word.lower()
+        parts.append(word)
+        parts.append(rng.choice(SEPARATORS))
+    return ''.join(parts)
+
+
+class FallbackExtractionParityTests(SimpleTestCase):
+    """The single-scan fallback must match the per-feature implementation it replaced."""
+
+    def test_matches_reference_on_random_text(self):
+        rng = random.Random(1234)
+        for _ in range(2000):
+            text = random_resume_text(rng)
+            extracted = fallback_extraction(text)
+            self.assertEqual(extracted['skills'], reference_skills(text), text)
+            self.assertEqual(extracted['seniority'], reference_seniority(text), text)
+            self.assertEqual(extracted['qualifications'], reference_qualifications(text), text)
+
+    def test_skills_match_whole_words_only(self):
+        extracted = fallback_extraction("Worked at Google on JavaScript and C++ services")
+        self.assertEqual(extracted['skills'], ['JavaScript', 'C++'])
+
+
+def reference_score(keywords, skills, seniority):
+    # Scoring before the FE/BE automata and per-skill memoization
+    skills_lower = [skill.lower() for skill in skills]
+    score = sum(10 for keyword in keywords if any(keyword in skill for skill in skills_lower))
+    score += SENIORITY_BONUS.get(seniority, 10)
+    return min(score, 100)
+
+
+def random_skill(rng):
+    keyword = rng.choice(FE_SKILLS + BE_SKILLS + COMMON_SKILLS)
+    affix = rng.choice(['', 'js', '3', ' framework', 'Pro', '.io'])
+    skill = affix + keyword if rng.random() < 0.2 else keyword + affix
+    return skill.upper() if rng.random() < 0.2 else skill
+
+
+class ScoringParityTests(SimpleTestCase):
+    """Memoized FE/BE scoring must match the nested keyword loops it replaced."""
+
+    def test_matches_reference_on_random_skills(self):
+        rng = random.Random(4321)
+        seniorities = list(SENIORITY_BONUS) + ['unknown']
+        for _ in range(2000):
+            skills = [random_skill(rng) for _ in range(rng.randint(0, 25))]
+            seniority = rng.choice(seniorities)
+            self.assertEqual(
+                calculate_scores_from_data(skills, seniority),
+                (reference_score(FE_SKILLS, skills, seniority), reference_score(BE_SKILLS, skills, seniority)),
+                skills
+            )
+
+    def test_keywords_match_inside_a_single_skill_only(self):
+        # "ja" + "va" across two skills must not count as "java"
+        self.assertEqual(calculate_scores_from_data(['ja', 'va'], 'mid'), (10, 10))
+
+
+# Enough of a PDF to pass the upload validation; these tests never parse it
+FAKE_PDF = b'%PDF-1.4\n' + b'0' * 2048
+
+
+def create_profile(name, skills=(), **fields):
+    """Create a saved profile (and its skill rows) through the normal save path."""
+    return CandidateProfile.objects.create(name=name, skills=list(skills), **fields)
+
+
+def make_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as zip_file:
+        for name, content in entries:
+            zip_file.writestr(name, content)
+    return SimpleUploadedFile('resumes.zip', buffer.getvalue(), content_type='application/zip')
+
+
+class CursorPaginationTests(TestCase):
+    """Keyset pagination of get_candidates and its opaque cursors."""
+
+    def test_cursor_round_trip(self):
+        profile = create_profile('Ada')
+        row = CandidateProfile.objects.values('id', 'created_at').get()
+        self.assertEqual(views._decode_cursor(views._encode_cursor(row)), (row['created_at'], profile.id))
+
+    async def test_pages_seek_through_every_candidate_once(self):
+        for number in range(7):
+            await CandidateProfile.objects.acreate(name=f'Candidate {number}', skills=[])
+        expected = [str(candidate_id) async for candidate_id in
+                    CandidateProfile.objects.order_by('-created_at', '-id').values_list('id', flat=True)]
+
+        seen = []
+        cursor = None
+        while True:
+            response = await self.async_client.post(
+                '/api/get-candidates/', orjson.dumps({'cursor': cursor, 'page_size': 3}),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 200)
+            data = orjson.loads(b''.join([chunk async for chunk in response.streaming_content]))
+            self.assertLessEqual(len(data['candidates']), 3)
+            seen.extend(candidate['id'] for candidate in data['candidates'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ['not-a-cursor', 'bm90fGF8dXVpZA==', 42]:
+            response = self.client.post(
+                '/api/get-candidates/', orjson.dumps({'cursor': cursor}), content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertEqual(response.json(), {"error": "Invalid cursor"})
+
+
+class PagePaginationTests(TestCase):
+    """Page-based get_candidates pagination."""
+
+    def test_pages_with_equal_timestamps_do_not_overlap(self):
+        for number in range(7):
+            create_profile(f'Candidate {number}')
+        CandidateProfile.objects.update(created_at=CandidateProfile.objects.first().created_at)
+
+        seen = []
+        for page in range(1, 5):
+            response = self.client.post(
+                '/api/get-candidates/', orjson.dumps({'page': page, 'page_size': 2}), content_type='application/json'
+            )
+            seen.extend(candidate['id'] for candidate in response.json()['candidates'])
+
+        self.assertEqual(sorted(seen), sorted(str(profile_id) for profile_id in
+                                              CandidateProfile.objects.values_list('id', flat=True)))
+
+
+class SkillFilterTests(TestCase):
+    """The skills filter matches candidates with ANY listed skill through CandidateSkill."""
+
+    def test_matches_any_skill_case_insensitively(self):
+        python_dev = create_profile('Python Dev', ['Python', 'Django'])
+        go_dev = create_profile('Go Dev', ['Go', 'React'])
+        create_profile('Java Dev', ['Java'])
+
+        response = self.client.post(
+            '/api/get-candidates/', orjson.dumps({'skills': ['python', ' GO ']}), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['total_count'], 2)
+        self.assertEqual({candidate['id'] for candidate in data['candidates']}, {str(python_dev.id), str(go_dev.id)})
+
+    def test_skill_rows_follow_profile_changes(self):
+        profile = create_profile('Dev', ['Python', ' python', 'React'])
+        self.assertEqual(set(profile.skill_index.values_list('name', flat=True)), {'python', 'react'})
+
+        profile.skills = ['Go']
+        profile.save()
+        self.assertEqual(list(CandidateSkill.objects.values_list('name', flat=True)), ['go'])
+
+
+class DuplicateUploadTests(TestCase):
+    """Uploads are deduplicated by the content hash of the file."""
+
+    def test_known_file_returns_existing_profile(self):
+        profile = create_profile('Ada', content_hash=resume_cache.hash_content(FAKE_PDF))
+
+        with mock.patch.object(views, 'process_resume_async') as process_resume_async:
+            response = self.client.post('/api/process/', {'resume': SimpleUploadedFile('cv.pdf', FAKE_PDF)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['message'], "Resume already processed")
+        self.assertEqual(response.json()['candidate_id'], str(profile.id))
+        process_resume_async.assert_not_called()
+        self.assertEqual(CandidateProfile.objects.count(), 1)
+
+    def test_batch_lists_known_files_with_their_profiles(self):
+        profile = create_profile('Ada', content_hash=resume_cache.hash_content(FAKE_PDF))
+
+        response = self.client.post('/api/process-batch/', {'resumes': [
+            SimpleUploadedFile('first.pdf', FAKE_PDF), SimpleUploadedFile('again.pdf', FAKE_PDF)
+        ]})
+
+        self.assertEqual(response.status_code, 201)
+        results = response.json()['results']
+        self.assertEqual([result['candidate_id'] for result in results], [str(profile.id)] * 2)
+        self.assertEqual(CandidateProfile.objects.count(), 1)
+
+    def test_bulk_save_reuses_concurrently_stored_profiles(self):
+        stored = create_profile('Ada', content_hash='a' * 32)
+        new_profiles = {
+            content_hash: CandidateProfile.from_parsed_data({'name': name, 'skills': ['Python']}, content_hash)
+            for content_hash, name in (('a' * 32, 'Ada again'), ('b' * 32, 'Bob'))
+        }
+
+        saved = views._save_new_profiles(new_profiles)
+
+        self.assertEqual(saved['a' * 32].id, stored.id)
+        self.assertEqual(set(CandidateProfile.objects.values_list('name', flat=True)), {'Ada', 'Bob'})
+        self.assertEqual(CandidateSkill.objects.filter(candidate__name='Bob').count(), 1)
+
+
+class UploadSizeLimitTests(TestCase):
+    """Oversized uploads are aborted while they stream in."""
+
+    def test_handler_stops_at_the_file_limit(self):
+        handler = MaxFileSizeUploadHandler(max_size=10)
+        handler.new_file('resume', 'cv.pdf', 'application/pdf', None)
+        self.assertEqual(handler.receive_data_chunk(b'x' * 8, 0), b'x' * 8)
+        with self.assertRaises(StopUpload):
+            handler.receive_data_chunk(b'x' * 3, 8)
+        self.assertTrue(handler.limit_exceeded)
+
+    def test_handler_applies_field_and_total_limits(self):
+        handler = MaxFileSizeUploadHandler(max_size=10, field_max_sizes={'archive': 100}, max_total_size=115)
+        handler.new_file('archive', 'a.zip', 'application/zip', None)
+        handler.receive_data_chunk(b'x' * 100, 0)
+        handler.new_file('resumes', 'cv.pdf', 'application/pdf', None)
+        handler.receive_data_chunk(b'x' * 10, 0)
+        handler.new_file('resumes', 'cv2.pdf', 'application/pdf', None)
+        with self.assertRaises(StopUpload):
+            handler.receive_data_chunk(b'x' * 10, 0)
+        self.assertTrue(handler.limit_exceeded)
+
+    def test_oversized_resume_is_rejected(self):
+        with mock.patch.object(views, 'MAX_RESUME_SIZE', 1024):
+            response = self.client.post('/api/process/', {'resume': SimpleUploadedFile('cv.pdf', FAKE_PDF)})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "File size must be less than 10MB"})
+        self.assertFalse(CandidateProfile.objects.exists())
+
+
+class RequestBodyLimitTests(SimpleTestCase):
+    """Oversized upload bodies are rejected before the Django application reads them."""
+
+    async def call(self, headers, chunks):
+        app_calls = []
+
+        async def app(scope, receive, send):
+            body = b''
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    app_calls.append('aborted')
+                    return
+                body += message['body']
+                if not message.get('more_body'):
+                    break
+            app_calls.append(body)
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b'ok'})
+
+        messages = [{'type': 'http.request', 'body': chunk, 'more_body': index < len(chunks) - 1}
+                    for index, chunk in enumerate(chunks)]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = RequestBodyLimitMiddleware(app, {'/api/process/': 10})
+        await middleware({'type': 'http', 'path': '/api/process/', 'headers': headers}, receive, send)
+        return sent[0]['status'], app_calls
+
+    async def test_declared_oversized_body_is_not_read(self):
+        status_code, app_calls = await self.call([(b'content-length', b'11')], [b'x' * 11])
+        self.assertEqual((status_code, app_calls), (413, []))
+
+    async def test_undeclared_oversized_body_is_cut_off(self):
+        status_code, app_calls = await self.call([], [b'x' * 6, b'x' * 6])
+        self.assertEqual((status_code, app_calls), (413, ['aborted']))
+
+    async def test_body_within_limit_reaches_the_app(self):
+        status_code, app_calls = await self.call([(b'content-length', b'10')], [b'x' * 4, b'x' * 6])
+        self.assertEqual((status_code, app_calls), (200, [b'x' * 10]))
+
+
+class ExceptionMiddlewareTests(SimpleTestCase):
+    """Unhandled API errors become 500 JSON responses; client errors keep their status."""
+
+    def test_too_many_files_is_a_client_error(self):
+        files = [SimpleUploadedFile(f'{number}.pdf', FAKE_PDF) for number in range(3)]
+        with override_settings(DATA_UPLOAD_MAX_NUMBER_FILES=2):
+            response = self.client.post('/api/process-batch/', {'resumes': files})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unexpected_error_is_a_json_500(self):
+        with mock.patch.object(views, '_read_resume_archive', side_effect=KeyError('boom')):
+            response = self.client.post('/api/process-batch/', {'archive': make_zip([('a.pdf', FAKE_PDF)])})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json(), {"error": "Internal server error: 'boom'"})
+
+
+class ResumeArchiveTests(SimpleTestCase):
+    """ZIP uploads are checked against their headers before anything is inflated."""
+
+    def test_reads_pdf_entries_only(self):
+        archive = make_zip([
+            ('cvs/a.pdf', FAKE_PDF), ('notes.txt', b'hello'), ('__MACOSX/cvs/._a.pdf', b'meta'), ('B.PDF', FAKE_PDF)
+        ])
+        self.assertEqual([resume_file.name for resume_file in views._read_resume_archive(archive)], ['a.pdf', 'B.PDF'])
+
+    def test_rejects_too_many_entries(self):
+        archive = make_zip([(f'{number}.pdf', FAKE_PDF) for number in range(views.MAX_BATCH_RESUMES + 1)])
+        with self.assertRaisesMessage(ValueError, "At most"):
+            views._read_resume_archive(archive)
+
+    def test_rejects_oversized_entry(self):
+        archive = make_zip([('big.pdf', FAKE_PDF)], compression=zipfile.ZIP_STORED)
+        with mock.patch.object(views, 'MAX_RESUME_SIZE', 1024), self.assertRaisesMessage(ValueError, "big.pdf"):
+            views._read_resume_archive(archive)
+
+    def test_rejects_oversized_total(self):
+        archive = make_zip([('a.pdf', FAKE_PDF), ('b.pdf', FAKE_PDF)], compression=zipfile.ZIP_STORED)
+        with mock.patch.object(views, 'MAX_BATCH_TOTAL_SIZE', 3 * 1024), \
+                self.assertRaisesMessage(ValueError, "in total"):
+            views._read_resume_archive(archive)
+
+    def test_rejects_implausible_compression_ratio(self):
+        archive = make_zip([('bomb.pdf', b'%PDF-' + b'\0' * (1024 * 1024))])
+        with self.assertRaisesMessage(ValueError, "Compression ratio"):
+            views._read_resume_archive(archive)
+
+    def test_rejects_encrypted_entry(self):
+        archive = make_zip([('locked.pdf', FAKE_PDF)])
+        with mock.patch.object(zipfile.ZipFile, 'read', side_effect=RuntimeError("password required")), \
+                self.assertRaisesMessage(ValueError, "locked.pdf: Encrypted"):
+            views._read_resume_archive(archive)
+
+    def test_batch_endpoint_rejects_unsupported_compression(self):
+        archive = make_zip([('a.pdf', FAKE_PDF)])
+        with mock.patch.object(zipfile.ZipFile, 'read', side_effect=NotImplementedError):
+            response = self.client.post('/api/process-batch/', {'archive': archive})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "a.pdf: Compression method is not supported"})
+
+    def test_batch_endpoint_rejects_invalid_archive(self):
+        response = self.client.post('/api/process-batch/', {
+            'archive': SimpleUploadedFile('resumes.zip', b'not a zip', content_type='application/zip')
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "archive must be a valid ZIP file"})
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'candidates': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-candidates'},
+})
+class ListingCacheTests(TestCase):
+    """Cached get_candidates pages are dropped whenever candidates change."""
+
+    def setUp(self):
+        caches['candidates'].clear()
+
+    def list_candidates(self):
+        response = self.client.post('/api/get-candidates/', orjson.dumps({}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['total_count']
+
+    def test_repeated_listing_is_served_from_cache(self):
+        create_profile('Ada')
+        self.assertEqual(self.list_candidates(), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.list_candidates(), 1)
+
+    def test_save_and_delete_invalidate(self):
+        self.assertEqual(self.list_candidates(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = create_profile('Ada')
+        self.assertEqual(self.list_candidates(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.delete()
+        self.assertEqual(self.list_candidates(), 0)
+
+    def test_bulk_insert_invalidates(self):
+        self.assertEqual(self.list_candidates(), 0)
+        new_profiles = {
+            content_hash: CandidateProfile.from_parsed_data({'name': content_hash}, content_hash)
+            for content_hash in ('a' * 32, 'b' * 32)
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            views._save_new_profiles(new_profiles)
+        self.assertEqual(self.list_candidates(), 2)
+
+
+def chat_completion(content):
+    """Build a fake ChatCompletion response whose message holds content."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class LLMAnswerValidationTests(SimpleTestCase):
+    """Only answers normalize_extracted_data can use are returned and cached."""
+
+    async def test_wrongly_typed_answer_is_not_cached(self):
+        for answer in ['{"name": null}', '{"skills": "Python"}', '{"skills": [1]}', '{"seniority": 3}', '[]']:
+            completion = mock.AsyncMock(return_value=chat_completion(answer))
+            with mock.patch.object(llm_cache, 'get_cached_response', return_value=None), \
+                    mock.patch.object(llm_cache, 'store_response') as store_response, \
+                    mock.patch.object(resume_parser, '_create_chat_completion_async', completion):
+                with self.assertRaises(ValueError, msg=answer):
+                    await resume_parser._complete_json_async('prompt', 10, None, None)
+            store_response.assert_not_called()
+
+    async def test_invalid_cached_answer_is_asked_again(self):
+        completion = mock.AsyncMock(return_value=chat_completion('{"name": "Ada Lovelace"}'))
+        with mock.patch.object(llm_cache, 'get_cached_response', return_value='{"name": null}'), \
+                mock.patch.object(llm_cache, 'store_response') as store_response, \
+                mock.patch.object(resume_parser, '_create_chat_completion_async', completion):
+            parsed_data = await resume_parser._complete_json_async('prompt', 10, None, None)
+
+        self.assertEqual(parsed_data, {"name": "Ada Lovelace"})
+        completion.assert_awaited_once()
+        store_response.assert_called_once_with(mock.ANY, '{"name": "Ada Lovelace"}')
+
+
+GROUP_RESUMES = ['Ada Lovelace\nPython engineer', 'Grace Hopper\nCOBOL developer', 'Alan Turing\nMathematician']
+
+
+def group_answer(*results):
+    """Build a combined LLM answer holding the given per-resume results."""
+    return orjson.dumps({'results': list(results)}).decode()
+
+
+class GroupExtractionTests(SimpleTestCase):
+    """Combined answers are matched to resumes by number and checked before use."""
+
+    async def extract_group(self, answer):
+        completion = mock.AsyncMock(return_value=chat_completion(answer))
+        individual = mock.AsyncMock(side_effect=lambda text_content, *args: {'name': f'individual: {text_content}'})
+        with mock.patch.object(llm_cache, 'get_cached_response', return_value=None), \
+                mock.patch.object(llm_cache, 'store_response'), \
+                mock.patch.object(resume_parser, '_create_chat_completion_async', completion), \
+                mock.patch.object(resume_parser, 'extract_data_with_llm_async', individual):
+            results = await resume_parser._extract_group_async(GROUP_RESUMES, asyncio.Semaphore(2), None)
+        completion.assert_awaited_once()
+        return [result['name'] for result in results], [call.args[0] for call in individual.await_args_list]
+
+    async def test_results_are_matched_by_number(self):
+        names, individually_extracted = await self.extract_group(group_answer(
+            {'resume': 3, 'name': 'Alan Turing'}, {'resume': 1, 'name': 'Ada Lovelace'},
+            {'resume': 2, 'name': 'Grace Hopper'}
+        ))
+        self.assertEqual(names, ['Ada Lovelace', 'Grace Hopper', 'Alan Turing'])
+        self.assertEqual(individually_extracted, [])
+
+    async def test_name_mismatch_is_extracted_again(self):
+        names, individually_extracted = await self.extract_group(group_answer(
+            {'resume': 1, 'name': 'Ada Lovelace'}, {'resume': 2, 'name': 'Alan Turing'},
+            {'resume': 3, 'name': 'Unknown'}
+        ))
+        self.assertEqual(names, ['Ada Lovelace', f'individual: {GROUP_RESUMES[1]}', 'Unknown'])
+        self.assertEqual(individually_extracted, [GROUP_RESUMES[1]])
+
+    async def test_misnumbered_answer_falls_back_per_resume(self):
+        answers = {
+            'missing': group_answer({'resume': 1, 'name': 'Ada Lovelace'}, {'resume': 2, 'name': 'Grace Hopper'}),
+            'duplicate': group_answer(
+                {'resume': 1, 'name': 'Ada Lovelace'}, {'resume': 1, 'name': 'Ada Lovelace'},
+                {'resume': 2, 'name': 'Grace Hopper'}
+            ),
+            'unnumbered': group_answer({'name': 'Ada Lovelace'}, {'name': 'Grace Hopper'}, {'name': 'Alan Turing'}),
+        }
+        for case, answer in answers.items():
+            with self.subTest(case):
+                names, individually_extracted = await self.extract_group(answer)
+                self.assertEqual(individually_extracted, GROUP_RESUMES)
+                self.assertEqual(names, [f'individual: {text_content}' for text_content in GROUP_RESUMES])
+
+
+class LLMCacheTestCase(SimpleTestCase):
+    """Runs each test against an empty cache database in a temporary directory."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for name, value in [
+            ('CACHE_PATH', f'{directory.name}/llm_cache.sqlite3'), ('_local', threading.local()),
+            ('_semantic_index', llm_cache._SemanticIndex()), ('_last_purge', 0.0),
+        ]:
+            patcher = mock.patch.object(llm_cache, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(lambda: llm_cache._get_connection().close())
+
+    def expired(self):
+        """Move the clock past the cache TTL and the purge interval."""
+        later = time.time() + llm_cache.CACHE_TTL + llm_cache.PURGE_INTERVAL + 1
+        return mock.patch.object(llm_cache.time, 'time', return_value=later)
+
+
+class LLMCacheTests(LLMCacheTestCase):
+    """Exact prompt cache lookups, expiry and purging."""
+
+    def test_store_and_lookup(self):
+        key = llm_cache.make_cache_key('model', 'Extract  the NAME')
+        llm_cache.store_response(key, '{"name": "Ada Lovelace"}')
+
+        self.assertEqual(llm_cache.get_cached_response(key), '{"name": "Ada Lovelace"}')
+        self.assertEqual(llm_cache.make_cache_key('model', 'extract the name'), key)
+        self.assertIsNone(llm_cache.get_cached_response(llm_cache.make_cache_key('other-model', 'Extract the name')))
+
+    def test_expired_entry_misses(self):
+        llm_cache.store_response('key', 'response')
+        with self.expired():
+            self.assertIsNone(llm_cache.get_cached_response('key'))
+
+    def test_write_purges_expired_entries(self):
+        llm_cache.store_response('old', 'response')
+        with self.expired():
+            llm_cache.store_response('new', 'response')
+        keys = [row[0] for row in llm_cache._get_connection().execute("SELECT key FROM llm_cache")]
+        self.assertEqual(keys, ['new'])
+
+    def test_database_error_is_a_miss(self):
+        with mock.patch.object(llm_cache, '_get_connection', side_effect=sqlite3.OperationalError('locked')):
+            llm_cache.store_response('key', 'response')
+            self.assertIsNone(llm_cache.get_cached_response('key'))
+
+
+class SemanticCacheTests(LLMCacheTestCase):
+    """Near-duplicate lookups through the in-memory embedding index."""
+
+    def test_close_embedding_matches(self):
+        llm_cache.store_semantic_match([1.0, 0.0, 0.0], {'name': 'Ada Lovelace'})
+        llm_cache.store_semantic_match([0.0, 1.0, 0.0], {'name': 'Grace Hopper'})
+
+        self.assertEqual(llm_cache.get_semantic_match([0.99, 0.05, 0.0]), {'name': 'Ada Lovelace'})
+        self.assertEqual(llm_cache.get_semantic_match([0.0, 2.0, 0.1]), {'name': 'Grace Hopper'})
+        self.assertIsNone(llm_cache.get_semantic_match([0.0, 0.0, 1.0]))
+        self.assertIsNone(llm_cache.get_semantic_match([1.0, 1.0, 0.0]))
+
+    def test_entries_stored_after_refresh_are_appended(self):
+        llm_cache.store_semantic_match([1.0, 0.0], {'name': 'Ada Lovelace'})
+        self.assertIsNone(llm_cache.get_semantic_match([0.0, 1.0]))
+
+        llm_cache.store_semantic_match([0.0, 1.0], {'name': 'Grace Hopper'})
+        self.assertEqual(llm_cache.get_semantic_match([0.0, 1.0]), {'name': 'Grace Hopper'})
+        self.assertEqual(llm_cache._semantic_index.size, 2)
+
+    def test_expired_entries_are_dropped(self):
+        llm_cache.store_semantic_match([1.0, 0.0], {'name': 'Ada Lovelace'})
+        self.assertIsNotNone(llm_cache.get_semantic_match([1.0, 0.0]))
+
+        with self.expired():
+            self.assertIsNone(llm_cache.get_semantic_match([1.0, 0.0]))
+        self.assertEqual(llm_cache._semantic_index.size, 0)
+
+    def test_index_grows_past_initial_capacity(self):
+        for number in range(1, 6):
+            llm_cache.store_semantic_match([1.0, float(number)], {'name': f'Candidate {number}'})
+            self.assertEqual(llm_cache.get_semantic_match([1.0, float(number)]), {'name': f'Candidate {number}'})
+        self.assertEqual(llm_cache._semantic_index.size, 5)
@@ -0,0 +1,53 @@
+"""
+Upload handlers for the resumes app.
+This module provides a per-file size check that stops storing an upload once a file
+passes its limit. Under ASGI, Django has already buffered the whole body by then, so
+body size is capped earlier by resumes.body_limit.
+"""
+
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+
+class MaxFileSizeUploadHandler(FileUploadHandler):
+    """
+    Stop parsing the upload as soon as any single file grows past its size limit.
+    
+    Files are limited to max_size bytes unless field_max_sizes gives a different
+    limit for their form field; max_total_size, if set, also caps all files of the
+    request together. Insert it first in request.upload_handlers so chunks
+    are counted before the memory/temporary-file handlers store them. The rest of
+    the body is read and discarded rather than the connection being reset, so the
+    client receives the view's 400. After request.FILES has been accessed,
+    limit_exceeded tells the view whether the upload was cut short.
+    """
+
+    def __init__(self, request=None, max_size=10 * 1024 * 1024, field_max_sizes=None, max_total_size=None):
+        super().__init__(request)
+        self.max_size = max_size
+        self.field_max_sizes = field_max_sizes or {}
+        self.max_total_size = max_total_size
+        self.current_max_size = max_size
+        self.received = 0
+        self.total_received = 0
+        self.limit_exceeded = False
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.current_max_size = self.field_max_sizes.get(field_name, self.max_size)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        self.total_received += len(raw_data)
+        if self.received > self.current_max_size or (
+            self.max_total_size is not None and self.total_received > self.max_total_size
+        ):
+            self.limit_exceeded = True
+            # Discard the rest of the body without storing it; resetting the connection
+            # would keep the 400 from reaching browsers
+            raise StopUpload(connection_reset=False)
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Let the next handler build the uploaded file
+        return None
@@ -5,5 +5,7 @@ from . import views
 urlpatterns = [
     path("api/health-check/", views.health_check),
     path("api/process/", views.process_resume_endpoint, name="process_resume"),
+    path("api/process/<str:job_id>/", views.process_resume_status, name="process_resume_status"),
+    path("api/process-batch/", views.process_resume_batch_endpoint, name="process_resume_batch"),
     path("api/get-candidates/", views.get_candidates, name="get_candidates"),
 ]
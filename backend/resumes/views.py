@@ -1,240 +1,698 @@
-import json
-from django.http import JsonResponse
+import os
+import uuid
+import asyncio
+import zipfile
+import orjson
+import base64
+from datetime import datetime
+from asgiref.sync import sync_to_async
+from celery.result import AsyncResult
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.core.files.storage import default_storage
-from django.db import IntegrityError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Q
 from rest_framework import status
 
-from .models import CandidateProfile, SeniorityChoices, QualificationChoices
-from .resume_parser import process_resume
+from . import candidate_cache, resume_cache
+from .models import CandidateProfile, CandidateSkill, SENIORITY_DISPLAY, QUALIFICATIONS_DISPLAY, normalize_skill
+from .resume_parser import ResumeProcessingError, process_resume_async, extract_texts_from_pdfs_async, batch_extract_async
+from .tasks import parse_resume_task
+from .upload_handlers import MaxFileSizeUploadHandler
 
 # Create your views here.
 
+RESUME_PROCESSING_QUEUE_ENABLED = getattr(settings, 'RESUME_PROCESSING_QUEUE_ENABLED', False)
+RESUME_UPLOAD_DIR = 'resume_uploads'
 
-def health_check(request):
-    return JsonResponse({"status": "ok"})
+MAX_RESUME_SIZE = 10 * 1024 * 1024
+PDF_HEADER_SEARCH_SIZE = 1024
+MAX_BATCH_RESUMES = 50
+MAX_BATCH_ARCHIVE_SIZE = 100 * 1024 * 1024
+# Caps everything a batch uploads and, for archives, everything they unpack to
+MAX_BATCH_TOTAL_SIZE = 100 * 1024 * 1024
+# PDFs are mostly compressed already; an entry that inflates further is a ZIP bomb
+MAX_ARCHIVE_COMPRESSION_RATIO = 100
+BULK_CREATE_BATCH_SIZE = 500
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+# Cursor pages are streamed row by row, so they can be larger
+MAX_STREAM_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 500
 
+# Filter values accepted by get_candidates, mapped to the stored values; the same
+# strings get_candidates returns
+SENIORITY_MAPPING = {display: value for value, display in SENIORITY_DISPLAY.items()}
+QUALIFICATIONS_MAPPING = {display: value for value, display in QUALIFICATIONS_DISPLAY.items()}
 
-@csrf_exempt
-@require_http_methods(["POST"])
-def process_resume_endpoint(request):
+INVALID_SENIORITY_ERROR = f"Invalid seniorityLevel value. Must be one of: {list(SENIORITY_MAPPING)}"
+INVALID_QUALIFICATIONS_ERROR = f"Invalid qualifications value. Must be one of: {list(QUALIFICATIONS_MAPPING)}"
+
+CANDIDATE_LIST_FIELDS = (
+    'id', 'name', 'skills', 'fe_score', 'be_score', 'seniority_display', 'qualifications_display',
+    'created_at', 'updated_at'
+)
+
+
+def _validate_resume_file(resume_file):
+    """Return an error message if the uploaded file is not an acceptable resume, else None."""
+    if not resume_file.name.lower().endswith('.pdf'):
+        return "Only PDF files are supported"
+    
+    if resume_file.size > MAX_RESUME_SIZE:
+        return "File size must be less than 10MB"
+    
+    # Reject non-PDF content before it reaches the parser and the LLM. Readers accept
+    # the header anywhere in the first 1KB, so the check does too.
+    head = resume_file.read(PDF_HEADER_SEARCH_SIZE)
+    resume_file.seek(0)
+    if b'%PDF-' not in head:
+        return "File is not a valid PDF"
+    
+    return None
+
+
+def json_response(data, status=status.HTTP_200_OK):
     """
-    POST /process endpoint - Accepts a PDF resume file and processes it.
+    Build a JSON response encoded with orjson.
+    
+    orjson is much faster than the stdlib encoder behind JsonResponse and encodes
+    UUIDs and datetimes natively, so callers can pass them through unconverted.
     """
-    try:
-        # Check if file is provided
-        if 'resume' not in request.FILES:
-            return JsonResponse(
-                {"error": "No resume file provided"}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+    return HttpResponse(orjson.dumps(data), content_type='application/json', status=status)
+
+
+def _serialize_candidate_row(row):
+    """Convert a CANDIDATE_LIST_FIELDS row to the display format returned by get_candidates."""
+    return {
+        "id": row['id'],
+        "name": row['name'],
+        "skills": row['skills'],
+        "fe_score": row['fe_score'],
+        "be_score": row['be_score'],
+        "seniority": row['seniority_display'],
+        "qualifications": row['qualifications_display'],
+        "created_at": row['created_at'],
+        "updated_at": row['updated_at']
+    }
+
+
+def _encode_cursor(row):
+    """Build the opaque cursor pointing just past the given row in (-created_at, -id) order."""
+    return base64.urlsafe_b64encode(f"{row['created_at'].isoformat()}|{row['id'].hex}".encode()).decode('ascii')
+
+
+def _decode_cursor(cursor):
+    """
+    Parse a cursor from _encode_cursor.
+    
+    Returns:
+        Tuple of (created_at, id) of the last row already returned
         
-        resume_file = request.FILES['resume']
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, candidate_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode().split('|')
+    return datetime.fromisoformat(created_at), uuid.UUID(candidate_id)
+
+
+async def _stream_candidates(rows, page_size, filters_applied):
+    """
+    Yield a get_candidates cursor page as JSON, one candidate at a time.
+    
+    rows holds up to page_size + 1 rows; the extra row only signals that a next
+    page exists. Rows are fetched in chunks as the client reads, so memory stays
+    flat for large pages; the generator is async so ASGI sends each chunk as it is
+    produced instead of buffering the whole page.
+    """
+    yield b'{"candidates":['
+    
+    last_row = None
+    has_more = False
+    count = 0
+    async for row in rows.aiterator(chunk_size=STREAM_CHUNK_SIZE):
+        if count == page_size:
+            has_more = True
+            break
+        yield (b',' if count else b'') + orjson.dumps(_serialize_candidate_row(row))
+        last_row = row
+        count += 1
+    
+    next_cursor = _encode_cursor(last_row) if has_more else None
+    yield (
+        b'],"next_cursor":' + orjson.dumps(next_cursor) + b',"page_size":' + orjson.dumps(page_size) +
+        b',"filters_applied":' + orjson.dumps(filters_applied) + b'}'
+    )
+
+
+def _limit_upload_size(request, field_max_sizes=None, max_total_size=None):
+    """
+    Install a handler that stops storing any uploaded file over MAX_RESUME_SIZE.
+    
+    field_max_sizes overrides the limit for specific form fields and max_total_size
+    caps all files together. Must run before request.FILES is first accessed.
+    """
+    upload_handler = MaxFileSizeUploadHandler(
+        request, max_size=MAX_RESUME_SIZE, field_max_sizes=field_max_sizes, max_total_size=max_total_size
+    )
+    request.upload_handlers.insert(0, upload_handler)
+    return upload_handler
+
+
+async def _parse_upload(request):
+    """
+    Parse the multipart body in a worker thread and return request.FILES.
+    
+    Parsing copies the whole upload (up to 100MB for batches); on the event loop
+    that would stall every other request the ASGI worker is serving.
+    """
+    return await sync_to_async(lambda: request.FILES)()
+
+
+def _read_resume_archive(archive):
+    """
+    Unpack the PDF resumes in an uploaded ZIP archive.
+    
+    Directories, non-PDF entries and macOS metadata are skipped. Entry sizes, their
+    total and their compression ratios are checked against the archive's own headers
+    before anything is decompressed; zipfile never inflates an entry past its
+    declared size, so the headers bound the memory used.
+    
+    Returns:
+        List of in-memory uploaded files, one per PDF entry
         
-        # Validate file type
-        if not resume_file.name.lower().endswith('.pdf'):
-            return JsonResponse(
-                {"error": "Only PDF files are supported"}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+    Raises:
+        zipfile.BadZipFile: If the upload is not a ZIP archive
+        ValueError: If the archive holds too many or too large resumes, or an entry
+            is encrypted or uses an unsupported compression method
+    """
+    with zipfile.ZipFile(archive) as zip_file:
+        entries = [
+            info for info in zip_file.infolist()
+            if not info.is_dir() and info.filename.lower().endswith('.pdf') and not info.filename.startswith('__MACOSX/')
+        ]
         
-        # Validate file size (max 10MB)
-        if resume_file.size > 10 * 1024 * 1024:
-            return JsonResponse(
-                {"error": "File size must be less than 10MB"}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        if len(entries) > MAX_BATCH_RESUMES:
+            raise ValueError(f"At most {MAX_BATCH_RESUMES} resumes can be processed per batch")
+        
+        if sum(info.file_size for info in entries) > MAX_BATCH_TOTAL_SIZE:
+            raise ValueError("Resumes in the archive must be less than 100MB in total")
+        
+        for info in entries:
+            name = os.path.basename(info.filename)
+            if info.file_size > MAX_RESUME_SIZE:
+                raise ValueError(f"{name}: File size must be less than 10MB")
+            if info.file_size > MAX_ARCHIVE_COMPRESSION_RATIO * max(info.compress_size, 1):
+                raise ValueError(f"{name}: Compression ratio is too high")
         
-        # Process the resume using the resume_parser service
+        resume_files = []
+        for info in entries:
+            name = os.path.basename(info.filename)
+            try:
+                content = zip_file.read(info)
+            except NotImplementedError:
+                raise ValueError(f"{name}: Compression method is not supported")
+            except RuntimeError:
+                # zipfile raises RuntimeError (a NotImplementedError base) for entries that need a password
+                raise ValueError(f"{name}: Encrypted entries are not supported")
+            resume_files.append(SimpleUploadedFile(name, content, content_type='application/pdf'))
+        
+        return resume_files
+
+
+
+def _insert_profiles(candidate_profiles):
+    """
+    Save every profile in one transaction with batched INSERTs instead of a commit per row.
+    """
+    with transaction.atomic():
+        CandidateProfile.objects.bulk_create(candidate_profiles, batch_size=BULK_CREATE_BATCH_SIZE)
+        # bulk_create() skips save(), so index the skills explicitly
+        CandidateSkill.objects.bulk_create(
+            CandidateSkill.for_profiles(candidate_profiles), batch_size=BULK_CREATE_BATCH_SIZE
+        )
+        # bulk_create() sends no post_save signals either
+        transaction.on_commit(candidate_cache.invalidate)
+
+
+def _save_new_profiles(new_profiles):
+    """
+    Save new profiles, reusing any that a concurrent upload of the same resume stored first.
+    
+    A duplicate content_hash rolls back the whole batch, so the profiles stored
+    meanwhile are looked up and only the rest are inserted again. Kept synchronous
+    so async views can run the transactions in one worker thread.
+    
+    Args:
+        new_profiles: Unsaved profiles keyed by content hash
+    
+    Returns:
+        Dict of the saved profiles keyed by content hash
+    """
+    try:
+        _insert_profiles(list(new_profiles.values()))
+        return new_profiles
+    except IntegrityError:
+        stored_profiles = CandidateProfile.objects.in_bulk(list(new_profiles), field_name='content_hash')
+        _insert_profiles([
+            candidate_profile for content_hash, candidate_profile in new_profiles.items()
+            if content_hash not in stored_profiles
+        ])
+        return {**new_profiles, **stored_profiles}
+
+
+def _duplicate_resume_response(candidate_profile):
+    """Build the response for an upload whose file already has a candidate profile."""
+    return json_response({
+        "message": "Resume already processed",
+        "candidate_id": str(candidate_profile.id),
+        "candidate_data": candidate_profile.to_candidate_data()
+    }, status=status.HTTP_200_OK)
+
+
+def health_check(request):
+    return json_response({"status": "ok"})
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def process_resume_endpoint(request):
+    """
+    POST /process endpoint - Accepts a PDF resume file and processes it.
+    
+    Async so that, under ASGI, a worker can serve other requests while this one
+    waits on the LLM. When the Celery queue is enabled the resume is handed to a
+    worker instead and the response is 202 with a job id to poll.
+    """
+    upload_handler = _limit_upload_size(request)
+    
+    # Parsing the upload streams it through the size check
+    files = await _parse_upload(request)
+    if 'resume' not in files and upload_handler.limit_exceeded:
+        return json_response(
+            {"error": "File size must be less than 10MB"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Check if file is provided
+    if 'resume' not in files:
+        return json_response(
+            {"error": "No resume file provided"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    resume_file = files['resume']
+    
+    # Validate file type and size (max 10MB)
+    validation_error = _validate_resume_file(resume_file)
+    if validation_error:
+        return json_response(
+            {"error": validation_error}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Read the upload once; the bytes are hashed and passed straight to the PDF parser
+    content = resume_file.read()
+    content_hash = resume_cache.hash_content(content)
+    
+    # An identical file was processed before: return its profile without parsing again
+    existing_profile = await CandidateProfile.objects.filter(content_hash=content_hash).afirst()
+    if existing_profile is not None:
+        return _duplicate_resume_response(existing_profile)
+    
+    # Queue the resume for a Celery worker instead of parsing it in the request; the
+    # message only carries the storage path, the worker reads the file itself
+    if RESUME_PROCESSING_QUEUE_ENABLED:
+        path = await sync_to_async(default_storage.save)(f"{RESUME_UPLOAD_DIR}/{uuid.uuid4()}.pdf", resume_file)
+        job = await sync_to_async(parse_resume_task.delay)(path, resume_file.name, content_hash)
+        return json_response({
+            "message": "Resume queued for processing",
+            "job_id": job.id
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    # Process the resume using the resume_parser service, unless the parser output
+    # for this file is still cached (e.g. its profile was deleted since)
+    parsed_data = await sync_to_async(resume_cache.get_parsed_data)(content_hash)
+    if parsed_data is None:
         try:
-            parsed_data = process_resume(resume_file)
-        except Exception as e:
-            return JsonResponse(
+            parsed_data = await process_resume_async(content)
+        except ResumeProcessingError as e:
+            return json_response(
                 {"error": f"Failed to process resume: {str(e)}"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-        
-        # Save the processed data to CandidateProfile model
+        await sync_to_async(resume_cache.store_parsed_data)(content_hash, parsed_data)
+    
+    # Save the processed data to CandidateProfile model
+    candidate_profile = CandidateProfile.from_parsed_data(parsed_data, content_hash=content_hash)
+    try:
+        await candidate_profile.asave()
+    except IntegrityError:
+        # A concurrent upload of the same file was saved first
+        existing_profile = await CandidateProfile.objects.aget(content_hash=content_hash)
+        return _duplicate_resume_response(existing_profile)
+    except DatabaseError as e:
+        return json_response(
+            {"error": f"Failed to save candidate profile: {str(e)}"}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    return json_response({
+        "message": "Resume processed successfully",
+        "candidate_id": str(candidate_profile.id),
+        "candidate_data": candidate_profile.to_candidate_data()
+    }, status=status.HTTP_201_CREATED)
+
+
+@require_http_methods(["GET"])
+def process_resume_status(request, job_id):
+    """
+    GET /process/<job_id> endpoint - Reports the state of a queued resume.
+    """
+    if not RESUME_PROCESSING_QUEUE_ENABLED:
+        return json_response(
+            {"error": "Resume processing queue is not enabled"}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    result = AsyncResult(job_id, app=parse_resume_task.app)
+    response_data = {"job_id": job_id, "status": result.state}
+    
+    if result.successful():
+        response_data.update(result.result)
+    elif result.failed():
+        response_data["error"] = f"Failed to process resume: {str(result.result)}"
+    
+    return json_response(response_data, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def process_resume_batch_endpoint(request):
+    """
+    POST /process-batch endpoint - Accepts several PDF resumes and processes them together.
+    
+    Resumes are uploaded either as several 'resumes' files or as one ZIP 'archive'.
+    LLM extraction for all files runs concurrently, so the batch takes roughly as long
+    as the slowest resume instead of the sum of all of them. Async like the single
+    resume endpoint, so under ASGI the worker serves other requests meanwhile.
+    """
+    upload_handler = _limit_upload_size(
+        request, field_max_sizes={'archive': MAX_BATCH_ARCHIVE_SIZE}, max_total_size=MAX_BATCH_TOTAL_SIZE
+    )
+    files = await _parse_upload(request)
+    archive = files.get('archive')
+    
+    if upload_handler.limit_exceeded:
+        return json_response(
+            {"error": "Each file must be less than 10MB (archives: 100MB), and 100MB in total"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if archive is not None:
         try:
-            candidate_profile = CandidateProfile.objects.create(
-                name=parsed_data.get('name', 'Unknown'),
-                skills=parsed_data.get('skills', []),
-                fe_score=parsed_data.get('fe_score', 0),
-                be_score=parsed_data.get('be_score', 0),
-                seniority=parsed_data.get('seniority', SeniorityChoices.JUNIOR),
-                qualifications=parsed_data.get('qualifications', QualificationChoices.BACHELORS)
+            resume_files = await asyncio.to_thread(_read_resume_archive, archive)
+        except zipfile.BadZipFile:
+            return json_response(
+                {"error": "archive must be a valid ZIP file"}, 
+                status=status.HTTP_400_BAD_REQUEST
             )
-            
-            return JsonResponse({
-                "message": "Resume processed successfully",
-                "candidate_id": str(candidate_profile.id),
-                "candidate_data": {
-                    "name": candidate_profile.name,
-                    "skills": candidate_profile.skills,
-                    "fe_score": candidate_profile.fe_score,
-                    "be_score": candidate_profile.be_score,
-                    "seniority": candidate_profile.seniority,
-                    "qualifications": candidate_profile.qualifications
-                }
-            }, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return JsonResponse(
-                {"error": f"Failed to save candidate profile: {str(e)}"}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        except ValueError as e:
+            return json_response(
+                {"error": str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
             )
+    else:
+        resume_files = files.getlist('resumes')
     
-    except Exception as e:
-        return JsonResponse(
-            {"error": f"Internal server error: {str(e)}"}, 
+    if not resume_files:
+        return json_response(
+            {"error": "No resume files provided"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if len(resume_files) > MAX_BATCH_RESUMES:
+        return json_response(
+            {"error": f"At most {MAX_BATCH_RESUMES} resumes can be processed per batch"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    for resume_file in resume_files:
+        validation_error = _validate_resume_file(resume_file)
+        if validation_error:
+            return json_response(
+                {"error": f"{resume_file.name}: {validation_error}"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    # Files that were uploaded before (or twice in this batch) are only processed once
+    content_hashes = []
+    for resume_file in resume_files:
+        content_hashes.append(resume_cache.hash_content(resume_file.read()))
+        resume_file.seek(0)
+    
+    existing_profiles = await CandidateProfile.objects.ain_bulk(set(content_hashes), field_name='content_hash')
+    new_files = {}
+    for resume_file, content_hash in zip(resume_files, content_hashes):
+        if content_hash not in existing_profiles:
+            new_files.setdefault(content_hash, resume_file)
+    
+    parsed_by_hash = await sync_to_async(resume_cache.get_many_parsed_data)(new_files)
+    
+    # Extract text up front, all files in parallel; unreadable files are reported
+    # without failing the batch
+    pending_hashes = [content_hash for content_hash in new_files if content_hash not in parsed_by_hash]
+    extracted_texts = await extract_texts_from_pdfs_async(
+        [new_files[content_hash].read() for content_hash in pending_hashes]
+    )
+    
+    failures = {}
+    extract_hashes = []
+    text_contents = []
+    for content_hash, text_content in zip(pending_hashes, extracted_texts):
+        if isinstance(text_content, ResumeProcessingError):
+            failures[content_hash] = f"Failed to process resume: {str(text_content)}"
+        elif not text_content.strip():
+            failures[content_hash] = "Failed to process resume: Could not extract text from PDF file"
+        else:
+            extract_hashes.append(content_hash)
+            text_contents.append(text_content)
+    
+    extracted_by_hash = dict(zip(extract_hashes, await batch_extract_async(text_contents)))
+    await sync_to_async(resume_cache.store_many_parsed_data)(extracted_by_hash)
+    parsed_by_hash.update(extracted_by_hash)
+    
+    new_profiles = {
+        content_hash: CandidateProfile.from_parsed_data(parsed_data, content_hash=content_hash)
+        for content_hash, parsed_data in parsed_by_hash.items()
+    }
+    try:
+        new_profiles = await sync_to_async(_save_new_profiles)(new_profiles)
+    except DatabaseError as e:
+        return json_response(
+            {"error": f"Failed to save candidate profiles: {str(e)}"}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+    
+    profiles_by_hash = {**existing_profiles, **new_profiles}
+    processed = []
+    errors = []
+    for resume_file, content_hash in zip(resume_files, content_hashes):
+        if content_hash in failures:
+            errors.append({"file": resume_file.name, "error": failures[content_hash]})
+            continue
+        candidate_profile = profiles_by_hash[content_hash]
+        processed.append({
+            "file": resume_file.name,
+            "candidate_id": str(candidate_profile.id),
+            "candidate_data": candidate_profile.to_candidate_data()
+        })
+    
+    return json_response({
+        "message": f"Processed {len(processed)} of {len(resume_files)} resumes",
+        "results": processed,
+        "errors": errors
+    }, status=status.HTTP_201_CREATED if processed else status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _get_candidates_page(conditions, filters, filters_applied, page, page_size):
+    """
+    Build the JSON body of a page-based get_candidates response, served from the cache when possible.
+    
+    Kept synchronous so the async view runs the cache lookups and both queries in
+    one worker thread.
+    """
+    # Serve repeated listings from the cache; it is invalidated whenever candidates change
+    cache_key = candidate_cache.make_cache_key({**filters_applied, "page": page, "page_size": page_size})
+    cached_body = candidate_cache.get_cached_response(cache_key)
+    if cached_body is not None:
+        return cached_body
+    
+    # Fetch only the requested page, as plain dicts rather than model instances; id
+    # breaks created_at ties (e.g. one bulk insert) so pages never overlap or skip rows
+    queryset = CandidateProfile.objects.filter(*conditions, **filters)
+    total_count = queryset.count()
+    offset = (page - 1) * page_size
+    rows = queryset.order_by('-created_at', '-id').values(*CANDIDATE_LIST_FIELDS)[offset:offset + page_size]
+    
+    body = orjson.dumps({
+        "candidates": [_serialize_candidate_row(row) for row in rows],
+        "total_count": total_count,
+        "page": page,
+        "page_size": page_size,
+        "filters_applied": filters_applied
+    })
+    candidate_cache.store_response(cache_key, body)
+    return body
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
-def get_candidates(request):
+async def get_candidates(request):
     """
     POST /get-candidates endpoint - Accepts filter criteria and returns matching candidates.
+    
+    Async so cursor pages can be streamed under ASGI.
     """
+    # Parse JSON body
     try:
-        # Parse JSON body
-        try:
-            data = json.loads(request.body)
-        except json.JSONDecodeError:
-            return JsonResponse(
-                {"error": "Invalid JSON in request body"}, 
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return json_response(
+            {"error": "Invalid JSON in request body"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Extract filter parameters with new naming
+    skills_filter = data.get('skills', [])
+    seniority_level = data.get('seniorityLevel', None)
+    qualifications_filter = data.get('qualifications', None)
+    fe_score = data.get('fe_score', None)
+    be_score = data.get('be_score', None)
+    page = data.get('page', 1)
+    page_size = data.get('page_size', DEFAULT_PAGE_SIZE)
+    # Sending "cursor" (null for the first page) switches to streamed keyset pagination
+    cursor_pagination = 'cursor' in data
+    cursor = data.get('cursor', None)
+    
+    # Validate filter parameters
+    if skills_filter and not isinstance(skills_filter, list):
+        return json_response(
+            {"error": "Skills filter must be an array of strings"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Validate and normalize seniority level
+    if seniority_level:
+        if seniority_level not in SENIORITY_MAPPING:
+            return json_response(
+                {"error": INVALID_SENIORITY_ERROR}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Extract filter parameters with new naming
-        skills_filter = data.get('skills', [])
-        seniority_level = data.get('seniorityLevel', None)
-        qualifications_filter = data.get('qualifications', None)
-        fe_score = data.get('fe_score', None)
-        be_score = data.get('be_score', None)
-        
-        # Validate filter parameters
-        if skills_filter and not isinstance(skills_filter, list):
-            return JsonResponse(
-                {"error": "Skills filter must be an array of strings"}, 
+        # Convert to lowercase for database query
+        seniority_filter = SENIORITY_MAPPING[seniority_level]
+    else:
+        seniority_filter = None
+    
+    # Validate and normalize qualifications
+    if qualifications_filter:
+        if qualifications_filter not in QUALIFICATIONS_MAPPING:
+            return json_response(
+                {"error": INVALID_QUALIFICATIONS_ERROR}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Validate and normalize seniority level
-        if seniority_level:
-            seniority_mapping = {
-                'Junior': 'junior',
-                'Mid': 'mid', 
-                'Senior': 'senior',
-                'Lead': 'lead',
-                'Principal': 'principal'
-            }
-            
-            if seniority_level not in seniority_mapping:
-                return JsonResponse(
-                    {"error": f"Invalid seniorityLevel value. Must be one of: {list(seniority_mapping.keys())}"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Convert to lowercase for database query
-            seniority_filter = seniority_mapping[seniority_level]
-        else:
-            seniority_filter = None
-        
-        # Validate and normalize qualifications
-        if qualifications_filter:
-            qualifications_mapping = {
-                'Bachelors': 'bachelors',
-                'Masters': 'masters',
-                'PhD': 'phd',
-                'Diploma': 'diploma',
-                'Certification': 'certification',
-                'High School': 'high_school'
-            }
-            
-            if qualifications_filter not in qualifications_mapping:
-                return JsonResponse(
-                    {"error": f"Invalid qualifications value. Must be one of: {list(qualifications_mapping.keys())}"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Convert to lowercase for database query
-            qualifications_db_value = qualifications_mapping[qualifications_filter]
-        else:
-            qualifications_db_value = None
-        
-        # Validate score filters
-        if fe_score is not None:
-            if not isinstance(fe_score, int) or fe_score < 0 or fe_score > 100:
-                return JsonResponse(
-                    {"error": "fe_score must be an integer between 0 and 100"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        if be_score is not None:
-            if not isinstance(be_score, int) or be_score < 0 or be_score > 100:
-                return JsonResponse(
-                    {"error": "be_score must be an integer between 0 and 100"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        # Start with all candidate profiles
-        queryset = CandidateProfile.objects.all()
-        
-        # Apply filters
-        if skills_filter:
-            # Filter candidates who have at least one of the specified skills
-            for skill in skills_filter:
-                queryset = queryset.filter(skills__icontains=skill)
-        
-        if seniority_filter:
-            queryset = queryset.filter(seniority=seniority_filter)
-        
-        if qualifications_db_value:
-            queryset = queryset.filter(qualifications=qualifications_db_value)
-        
-        if fe_score is not None:
-            queryset = queryset.filter(fe_score__gte=fe_score)
-        
-        if be_score is not None:
-            queryset = queryset.filter(be_score__gte=be_score)
-        
-        # Serialize the results
-        candidates_data = []
-        for candidate in queryset:
-            # Convert back to display format for response
-            display_seniority = candidate.seniority.title() if candidate.seniority != 'mid' else 'Mid'
-            display_qualifications = candidate.qualifications.replace('_', ' ').title()
-            
-            candidates_data.append({
-                "id": str(candidate.id),
-                "name": candidate.name,
-                "skills": candidate.skills,
-                "fe_score": candidate.fe_score,
-                "be_score": candidate.be_score,
-                "seniority": display_seniority,
-                "qualifications": display_qualifications,
-                "created_at": candidate.created_at.isoformat(),
-                "updated_at": candidate.updated_at.isoformat()
-            })
-        
-        return JsonResponse({
-            "candidates": candidates_data,
-            "total_count": len(candidates_data),
-            "filters_applied": {
-                "skills": skills_filter,
-                "seniorityLevel": seniority_level,
-                "qualifications": qualifications_filter,
-                "fe_score": fe_score,
-                "be_score": be_score
-            }
-        }, status=status.HTTP_200_OK)
-        
-    except Exception as e:
-        return JsonResponse(
-            {"error": f"Internal server error: {str(e)}"}, 
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        # Convert to lowercase for database query
+        qualifications_db_value = QUALIFICATIONS_MAPPING[qualifications_filter]
+    else:
+        qualifications_db_value = None
+    
+    # Validate score filters
+    if fe_score is not None:
+        if not isinstance(fe_score, int) or fe_score < 0 or fe_score > 100:
+            return json_response(
+                {"error": "fe_score must be an integer between 0 and 100"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    if be_score is not None:
+        if not isinstance(be_score, int) or be_score < 0 or be_score > 100:
+            return json_response(
+                {"error": "be_score must be an integer between 0 and 100"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    # Validate pagination
+    if not isinstance(page, int) or page < 1:
+        return json_response(
+            {"error": "page must be a positive integer"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    max_page_size = MAX_STREAM_PAGE_SIZE if cursor_pagination else MAX_PAGE_SIZE
+    if not isinstance(page_size, int) or page_size < 1 or page_size > max_page_size:
+        return json_response(
+            {"error": f"page_size must be an integer between 1 and {max_page_size}"}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if cursor is not None:
+        try:
+            cursor_created_at, cursor_id = _decode_cursor(cursor)
+        except (ValueError, AttributeError):
+            return json_response(
+                {"error": "Invalid cursor"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    # Collect every filter so the queryset is built with a single filter() call
+    filters = {}
+    if seniority_filter:
+        filters['seniority'] = seniority_filter
+    
+    if qualifications_db_value:
+        filters['qualifications'] = qualifications_db_value
+    
+    if fe_score is not None:
+        filters['fe_score__gte'] = fe_score
+    
+    if be_score is not None:
+        filters['be_score__gte'] = be_score
+    
+    conditions = []
+    if skills_filter:
+        # Filter candidates who have any of the specified skills, using the skill index
+        # as an EXISTS probe so no join or DISTINCT over the profile rows is needed
+        normalized_skills = {normalize_skill(skill) for skill in skills_filter if isinstance(skill, str)}
+        conditions.append(Exists(
+            CandidateSkill.objects.filter(candidate=OuterRef('pk'), name__in=normalized_skills)
+        ))
+    
+    if cursor is not None:
+        # Keyset pagination: seek past the cursor instead of counting and skipping rows
+        conditions.append(Q(created_at__lt=cursor_created_at) | Q(created_at=cursor_created_at, id__lt=cursor_id))
+    
+    filters_applied = {
+        "skills": skills_filter,
+        "seniorityLevel": seniority_level,
+        "qualifications": qualifications_filter,
+        "fe_score": fe_score,
+        "be_score": be_score
+    }
+    
+    if cursor_pagination:
+        rows = CandidateProfile.objects.filter(*conditions, **filters).order_by('-created_at', '-id') \
+            .values(*CANDIDATE_LIST_FIELDS)[:page_size + 1]
+        return StreamingHttpResponse(
+            _stream_candidates(rows, page_size, filters_applied),
+            content_type='application/json'
         )
+    
+    body = await sync_to_async(_get_candidates_page)(conditions, filters, filters_applied, page, page_size)
+    return HttpResponse(body, content_type='application/json')
+